@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# Measures the startup cost of the package: `import unisat` and the construction of a
+# `unisat.Client`, each in a fresh interpreter, with `python -X importtime`.
+#
+# usage: python3 benchmarks/bench_import.py [--repeat N] [--top N] [--json]
+#                                           [--max-import-ms MS] [--max-client-ms MS]
+#
+# The time reported is the one of the modules imported on top of a bare interpreter.
+# The run fails (exit status 1) when a budget is exceeded or when constructing a client
+# loads one of the LAZY modules, which are only needed once a call is sent.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SCENARIOS = {
+    'import': 'import unisat',
+    'client': "import unisat; unisat.Client(unisat.MAINNET, '0' * 64, log_config=None)",
+}
+
+# Modules loaded on the first call, by the HTTP session and the JSON decoder, or by asyncio
+LAZY = ('requests', 'urllib3', 'asyncio', 'orjson', 'msgspec')
+
+def import_times(code):
+    """
+    Runs `code` in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        dict: The self and cumulative microseconds of each top-level import.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        (self_us, cumulative_us, name) = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def measure(code, repeat):
+    baseline = import_times('pass')
+    runs = []
+    for _ in range(repeat):
+        times = import_times(code)
+        runs.append({name: value for (name, value) in times.items() if name not in baseline})
+    totals = [sum(cumulative for (_, cumulative) in run.values()) for run in runs]
+    last = runs[-1]
+    modules = subprocess.run([sys.executable, '-c', f'{code}; import sys; print(*sys.modules)'],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    loaded = sorted({name.split('.')[0] for name in modules} & set(LAZY))
+    top = sorted(last.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        'median_ms': statistics.median(totals) / 1000,
+        'min_ms': min(totals) / 1000,
+        'modules': len(last),
+        'top': [{'module': name, 'cumulative_ms': cumulative / 1000}
+                for (name, (_, cumulative)) in top],
+        'lazy_loaded': loaded,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8, help='slowest imports listed')
+    parser.add_argument('--max-import-ms', type=float, help='budget of `import unisat`')
+    parser.add_argument('--max-client-ms', type=float, help='budget of the client scenario')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = {name: measure(code, args.repeat) for (name, code) in SCENARIOS.items()}
+    failures = []
+    budgets = {'import': args.max_import_ms, 'client': args.max_client_ms}
+    for (name, result) in results.items():
+        if budgets[name] is not None and result['median_ms'] > budgets[name]:
+            failures.append(f'{name}: {result["median_ms"]:.1f} ms > {budgets[name]} ms')
+        if result['lazy_loaded']:
+            failures.append(f'{name}: loads {", ".join(result["lazy_loaded"])}')
+
+    if args.json:
+        print(json.dumps({'results': results, 'failures': failures}, indent=2))
+    else:
+        for (name, result) in results.items():
+            print(f'{name:<8} {result["median_ms"]:>8.1f} ms (min {result["min_ms"]:.1f} ms, '
+                  f'{result["modules"]} top-level modules)')
+            for entry in result['top'][:args.top]:
+                print(f'    {entry["module"]:<30} {entry["cumulative_ms"]:>8.2f} ms')
+        for failure in failures:
+            print(f'FAILED {failure}')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# Compares the decoding of large API pages: the former `req.json()` + dict merge path
+# against the JSON backends of `unisat.codec` wrapped in `unisat.Response`.
+#
+# usage: python3 benchmarks/bench_json.py [--rows N] [--repeat N] [--json] [page.json ...]
+# Recorded pages (raw response bodies saved to files) can be given as arguments,
+# otherwise a synthetic `get_brc20_holders` page of `--rows` holders is generated.
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unisat import codec
+from unisat.response import Response
+
+def make_holders_page(rows):
+    detail = [{'address': f'bc1p{i:058x}', 'overallBalance': f'{i * 1000.123456789:.18f}',
+               'transferableBalance': '0.000000000000000000',
+               'availableBalance': f'{i * 1000.123456789:.18f}'} for i in range(rows)]
+    payload = {'code': 0, 'msg': 'ok',
+               'data': {'height': 820000, 'total': rows, 'start': 0, 'detail': detail}}
+    return json.dumps(payload).encode('utf-8')
+
+def legacy_decode(body):
+    # what `_send_request` did before: text decoding, `json.loads`, then a merged copy
+    output = json.loads(body.decode('utf-8'))
+    return {**{'http_status_code': 200}, **output}
+
+def backend_decode(loads):
+    def decode(body):
+        return Response(200, loads(body))
+    return decode
+
+def measure(decode, body, repeat):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        decode(body)
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    result = decode(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return {'best_ms': min(timings) * 1000, 'mean_ms': sum(timings) / repeat * 1000,
+            'peak_mib': peak / 2 ** 20}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('pages', nargs='*', help='recorded response bodies')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = {}
+        for path in args.pages:
+            with open(path, 'rb') as f:
+                pages[os.path.basename(path)] = f.read()
+    else:
+        pages = {f'holders-{args.rows}': make_holders_page(args.rows)}
+
+    decoders = {'legacy (json + merge)': legacy_decode}
+    for name in codec.BACKENDS:
+        try:
+            decoders[name] = backend_decode(codec.get_loads(name)[1])
+        except ImportError:
+            continue
+
+    results = []
+    for (page, body) in pages.items():
+        for (name, decode) in decoders.items():
+            result = {'page': page, 'bytes': len(body), 'decoder': name}
+            result.update(measure(decode, body, args.repeat))
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"page":<20} {"decoder":<22} {"best ms":>10} {"mean ms":>10} {"peak MiB":>10}')
+    for r in results:
+        print(f'{r["page"]:<20} {r["decoder"]:<22} {r["best_ms"]:>10.2f} {r["mean_ms"]:>10.2f} '
+              f'{r["peak_mib"]:>10.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Measures the per-call overhead of the client logging at INFO and DEBUG levels.
+#
+# usage: python3 benchmarks/bench_logging.py [--rows N] [--calls N] [--json]
+# The network is replaced by a session replaying a recorded `get_brc20_holders` page of
+# `--rows` holders, so only request building, decoding and logging are measured.
+# DEBUG logs are written to os.devnull.
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import unisat
+from bench_json import make_holders_page
+
+class ReplaySession:
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, **kwargs):
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = self.body
+        return response
+
+    def close(self):
+        pass
+
+def measure(level, body, calls):
+    client = unisat.Client(endpoint=unisat.MAINNET, api_key='0' * 64, log_config=os.devnull,
+                           log_level=level, retry_policy=unisat.RetryPolicy(max_attempts=1),
+                           coalesce=False)
+    client.session = ReplaySession(body)
+    params = {'start': 0, 'limit': 500}
+    started = time.perf_counter()
+    for _ in range(calls):
+        client.call('GET', '/v1/indexer/brc20/ordi/holders', params)
+    elapsed = time.perf_counter() - started
+    client.close()
+    return {'level': logging.getLevelName(level), 'calls': calls,
+            'per_call_us': elapsed / calls * 1e6}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    body = make_holders_page(args.rows)
+    results = [measure(level, body, args.calls) for level in (logging.INFO, logging.DEBUG)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'page of {args.rows} holders ({len(body)} bytes), {args.calls} calls')
+    for r in results:
+        print(f'{r["level"]:<6} {r["per_call_us"]:>10.1f} us/call')
+
+if __name__ == '__main__':
+    main()
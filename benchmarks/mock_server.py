@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# A local stand-in of the UniSat API serving the `/v1/indexer/...` routes used by the
+# UDS modules with deterministic synthetic data.
+#
+# usage: python3 benchmarks/mock_server.py [--port N] [--latency S] [--total N] ...
+#        (or `with MockServer(...) as server:` from a benchmark, see benchmarks/run.py)
+#
+# Latency, slow responses, list sizes, rate limit (403 'exceeds rate limit') and error
+# (HTTP 500) injection are configurable. Parameters are read from the query string and from a
+# JSON body.
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+BEST_HEIGHT = 820000
+
+def _hash(*parts):
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+def _address(i):
+    return f'bc1p{i:058x}'
+
+def _page(params, total, make, offset_key, size_key, max_page):
+    offset = int(params.get(offset_key, 0) or 0)
+    size = min(int(params.get(size_key, 16) or 16), max_page)
+    end = min(offset + size, total)
+    return [make(i) for i in range(offset, max(offset, end))]
+
+class MockServer:
+    """
+    A local stand-in of the UniSat API, running on a background thread.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, total=1000,
+                 max_page=500, rate_limit=None, rate_limit_probability=0.0,
+                 error_probability=0.0, slow_probability=0.0, slow_latency=1.0,
+                 best_height=BEST_HEIGHT, seed=0):
+        """
+        Parameters:
+            host (str, optional): Address to listen on.
+            port (int, optional): Port to listen on, 0 for a free port.
+            latency (float, optional): Seconds added to each response.
+            jitter (float, optional): Random seconds added on top of `latency`.
+            total (int, optional): Number of records of every paginated list.
+            max_page (int, optional): Maximum number of records returned per page.
+            rate_limit (float, optional): Requests per second above which 403 'exceeds rate
+                                          limit' is returned. Defaults to None (no limit).
+            rate_limit_probability (float, optional): Ratio of requests rejected with 403.
+            error_probability (float, optional): Ratio of requests failing with HTTP 500.
+            slow_probability (float, optional): Ratio of requests answered after
+                                                `slow_latency` more seconds (stragglers).
+            slow_latency (float, optional): Seconds added to the slow responses.
+            best_height (int, optional): Block height reported by the server.
+            seed (int, optional): Seed of the random injections.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.total = total
+        self.max_page = max_page
+        self.rate_limit = rate_limit
+        self.rate_limit_probability = rate_limit_probability
+        self.error_probability = error_probability
+        self.slow_probability = slow_probability
+        self.slow_latency = slow_latency
+        self.best_height = best_height
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._window = []
+        self._route_table = self._routes()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the server, to be used as `endpoint`."""
+        (host, port) = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+        return False
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of requests served and TCP connections accepted.
+        """
+        with self._lock:
+            return {'requests': self.requests, 'connections': self.connections}
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.connections = 0
+
+    def respond(self, path, params):
+        """
+        Builds the response of a request.
+
+        Returns:
+            tuple: The HTTP status code, the JSON payload and the extra headers.
+        """
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.rate_limit:
+                self._window = [t for t in self._window if now - t < 1.0]
+                self._window.append(now)
+                limited = len(self._window) > self.rate_limit
+            else:
+                limited = False
+            draw = self.random.random()
+            slow = self.slow_probability and self.random.random() < self.slow_probability
+        delay = self.latency + (self.random.random() * self.jitter if self.jitter else 0)
+        if slow:
+            delay += self.slow_latency
+        if delay:
+            time.sleep(delay)
+        if limited or draw < self.rate_limit_probability:
+            return (403, {'code': -2003, 'msg': 'exceeds rate limit', 'data': None},
+                    {'Retry-After': '1'})
+        if draw < self.rate_limit_probability + self.error_probability:
+            return (500, {'code': -1, 'msg': 'internal error', 'data': None}, {})
+        for (pattern, build) in self._route_table:
+            match = pattern.match(path)
+            if match:
+                return (200, {'code': 0, 'msg': 'ok', 'data': build(params, *match.groups())}, {})
+        return (404, {'code': -1, 'msg': 'not found', 'data': None}, {})
+
+    def _routes(self):
+        total, max_page = self.total, self.max_page
+
+        def tx(txid, i=0):
+            height = self.best_height - i % 1000
+            return {'txid': txid, 'height': height, 'blkid': _hash('block', height),
+                    'nIn': 2, 'nOut': 2, 'inSatoshi': 20000, 'outSatoshi': 19000,
+                    'nNewInscription': 0, 'nInInscription': 0, 'nOutInscription': 0,
+                    'nLostInscription': 0, 'timestamp': 1700000000 + i, 'size': 250,
+                    'vsize': 150, 'weight': 600, 'locktime': 0, 'confirmations': i % 1000 + 1}
+
+        def vio(txid, i):
+            return {'txid': txid, 'vout': i, 'address': _address(i), 'satoshi': 10000 + i,
+                    'scriptPk': f'5120{i:064x}', 'inscriptions': []}
+
+        def utxo(address, i):
+            return {'txid': _hash('utxo', address, i), 'vout': i % 4, 'satoshi': 546 + i,
+                    'scriptType': '5120', 'scriptPk': f'5120{i:064x}', 'codeType': 9,
+                    'address': address, 'height': self.best_height - i, 'idx': i,
+                    'isOpInRBF': False, 'inscriptions': []}
+
+        def holder(i):
+            balance = f'{(total - i) * 1000.5:.18f}'
+            return {'address': _address(i), 'overallBalance': balance,
+                    'transferableBalance': '0.000000000000000000', 'availableBalance': balance}
+
+        def history(ticker, i, txid=None, address=None):
+            return {'ticker': ticker, 'type': ('inscribe-mint', 'transfer')[i % 2],
+                    'valid': True, 'txid': txid or _hash('history', ticker, i), 'idx': 0,
+                    'vout': 0, 'inscriptionNumber': 1000000 + i,
+                    'inscriptionId': f'{_hash("inscription", i)}i0',
+                    'from': address or _address(i + 1), 'to': _address(i),
+                    'satoshi': 546, 'amount': '1000', 'overallBalance': '1000',
+                    'transferBalance': '0', 'availableBalance': '1000',
+                    'height': self.best_height - i % 1000, 'txidx': i,
+                    'blockhash': _hash('block', i), 'blocktime': 1700000000 + i}
+
+        def ticker_info(ticker):
+            return {'ticker': ticker, 'holdersCount': total, 'historyCount': total,
+                    'inscriptionNumber': 348020, 'inscriptionId': f'{_hash("deploy", ticker)}i0',
+                    'max': '21000000', 'limit': '1000', 'minted': '21000000',
+                    'totalMinted': '21000000', 'confirmedMinted': '21000000',
+                    'confirmedMinted1h': '0', 'confirmedMinted24h': '0', 'mintTimes': 21000,
+                    'decimal': 18, 'creator': _address(0), 'txid': _hash('deploy', ticker),
+                    'deployHeight': 779832, 'deployBlocktime': 1678248991,
+                    'completeHeight': 779900, 'completeBlocktime': 1678250000,
+                    'inscriptionNumberStart': 348020, 'inscriptionNumberEnd': 400000}
+
+        def start_page(params, make, offset_key='start', size_key='limit'):
+            return {'height': self.best_height, 'total': total,
+                    'start': int(params.get(offset_key, 0) or 0),
+                    'detail': _page(params, total, make, offset_key, size_key, max_page)}
+
+        def cursor_page(params, key, make):
+            return {'cursor': int(params.get('cursor', 0) or 0), 'total': total,
+                    'totalConfirmed': total, 'totalUnconfirmed': 0, 'totalUnconfirmedSpend': 0,
+                    key: _page(params, total, make, 'cursor', 'size', max_page)}
+
+        routes = [
+            (r'/v1/indexer/blockchain/info', lambda p: {
+                'chain': 'main', 'blocks': self.best_height, 'headers': self.best_height,
+                'bestBlockHash': _hash('block', self.best_height),
+                'prevBlockHash': _hash('block', self.best_height - 1),
+                'difficulty': '', 'medianTime': 1700000000, 'chainwork': ''}),
+            (r'/v1/indexer/brc20/bestheight', lambda p: {
+                'height': self.best_height, 'blockid': _hash('block', self.best_height),
+                'timestamp': 1700000000, 'total': total}),
+            (r'/v1/indexer/block/(\d+)/txs', lambda p, h: _page(
+                p, total, lambda i: {**tx(_hash('tx', h, i), i), 'height': int(h)}, 'cursor',
+                'size', max_page)),
+            (r'/v1/indexer/tx/([^/]+)/ins', lambda p, txid: _page(
+                p, 2, lambda i: vio(_hash('prev', txid, i), i), 'cursor', 'size', max_page)),
+            (r'/v1/indexer/tx/([^/]+)/outs', lambda p, txid: _page(
+                p, 2, lambda i: vio(txid, i), 'cursor', 'size', max_page)),
+            (r'/v1/indexer/tx/([^/]+)', lambda p, txid: tx(txid)),
+            (r'/v1/indexer/address/([^/]+)/balance', lambda p, a: {
+                'address': a, 'satoshi': 100000, 'pendingSatoshi': 0, 'utxoCount': total,
+                'btcSatoshi': 90000, 'btcPendingSatoshi': 0, 'btcUtxoCount': total,
+                'inscriptionSatoshi': 10000, 'inscriptionPendingSatoshi': 0,
+                'inscriptionUtxoCount': total}),
+            (r'/v1/indexer/address/([^/]+)/history', lambda p, a: {
+                'cursor': int(p.get('cursor', 0) or 0), 'total': total,
+                'detail': _page(p, total, lambda i: tx(_hash('tx', a, i), i), 'cursor', 'size',
+                                max_page)}),
+            (r'/v1/indexer/address/([^/]+)/utxo-data', lambda p, a: cursor_page(
+                p, 'utxo', lambda i: utxo(a, i))),
+            (r'/v1/indexer/address/([^/]+)/inscription-utxo-data', lambda p, a: cursor_page(
+                p, 'utxo', lambda i: utxo(a, i))),
+            (r'/v1/indexer/inscription/info/([^/]+)', lambda p, iid: {
+                'utxo': utxo(_address(1), 0), 'address': _address(1), 'offset': 0,
+                'inscriptionIndex': 0, 'inscriptionNumber': 1000000, 'inscriptionId': iid,
+                'contentType': 'text/plain;charset=utf-8', 'contentLength': 60,
+                'contentBody': '', 'height': self.best_height - 1000, 'timestamp': 1700000000,
+                'inSatoshi': 546, 'outSatoshi': 546, 'brc20': None, 'detail': None}),
+            (r'/v1/indexer/brc20/list', lambda p: start_page(p, lambda i: f'{i:04x}')),
+            (r'/v1/indexer/brc20/([^/]+)/info', lambda p, t: ticker_info(t)),
+            (r'/v1/indexer/brc20/([^/]+)/holders', lambda p, t: start_page(p, holder)),
+            (r'/v1/indexer/brc20/([^/]+)/history', lambda p, t: start_page(
+                p, lambda i: history(t, i))),
+            (r'/v1/indexer/brc20/([^/]+)/tx/([^/]+)/history', lambda p, t, txid: start_page(
+                p, lambda i: history(t, i, txid=txid))),
+            (r'/v1/indexer/address/([^/]+)/brc20/summary', lambda p, a: start_page(
+                p, lambda i: {'ticker': f'{i:04x}', 'overallBalance': '1000',
+                              'transferableBalance': '0', 'availableBalance': '1000'})),
+            (r'/v1/indexer/address/([^/]+)/brc20/([^/]+)/info', lambda p, a, t: {
+                'ticker': t, 'overallBalance': '1000', 'transferableBalance': '0',
+                'availableBalance': '1000', 'availableBalanceSafe': '1000',
+                'availableBalanceUnSafe': '0', 'transferableCount': 0,
+                'transferableInscriptions': [], 'historyCount': total, 'historyInscriptions': []}),
+            (r'/v1/indexer/address/([^/]+)/brc20/([^/]+)/history', lambda p, a, t: start_page(
+                p, lambda i: history(t, i, address=a))),
+            (r'/v1/indexer/address/([^/]+)/brc20/([^/]+)/transferable-inscriptions',
+             lambda p, a, t: start_page(p, lambda i: {
+                 'inscriptionId': f'{_hash("transfer", a, i)}i0', 'inscriptionNumber': i,
+                 'amount': '1000', 'ticker': t})),
+        ]
+        return [(re.compile(f'^{pattern}$'), build) for (pattern, build) in routes]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                with server._lock:
+                    server.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = dict(parse_qsl(url.query))
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    try:
+                        params.update(json.loads(self.rfile.read(length)))
+                    except ValueError:
+                        pass
+                (status, payload, headers) = server.respond(url.path, params)
+                body = json.dumps(payload).encode('utf-8')
+                head = f'HTTP/1.1 {status} {self.responses[status][0]}\r\n'
+                head += 'Content-Type: application/json\r\n'
+                head += f'Content-Length: {len(body)}\r\n'
+                for (name, value) in headers.items():
+                    head += f'{name}: {value}\r\n'
+                if self.headers.get('Connection', '').lower() == 'close':
+                    head += 'Connection: close\r\n'
+                    self.close_connection = True
+                # headers and body in a single write, to avoid delayed ACK stalls
+                self.wfile.write(head.encode('latin-1') + b'\r\n' + body)
+
+            do_POST = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--total', type=int, default=1000)
+    parser.add_argument('--max-page', type=int, default=500)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--rate-limit-probability', type=float, default=0.0)
+    parser.add_argument('--error-probability', type=float, default=0.0)
+    parser.add_argument('--slow-probability', type=float, default=0.0)
+    parser.add_argument('--slow-latency', type=float, default=1.0)
+    args = parser.parse_args()
+    server = MockServer(args.host, args.port, args.latency, args.jitter, args.total,
+                        args.max_page, args.rate_limit, args.rate_limit_probability,
+                        args.error_probability, args.slow_probability, args.slow_latency)
+    print(f'serving on {server.url}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
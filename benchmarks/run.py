@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# Offline benchmark of `unisat.Client` against the local stand-in of the API
+# (benchmarks/mock_server.py): no API key nor network access needed.
+#
+# usage: python3 benchmarks/run.py [--latency S] [--calls N] [--rows N] [--workers N]
+#                                  [--slow-probability P] [--slow-latency S]
+#                                  [--output results.json] [--baseline previous.json]
+#
+# Scenarios: sequential single calls (with and without keep-alive, with hedging),
+# paginated sweep of a ticker holders (with and without prefetch), bulk fan-out with
+# `Client.map()` and with `AsyncClient`. For each of them: throughput, p50/p99 latency
+# and peak traced memory. Stragglers are injected with --slow-probability, e.g.
+# `--slow-probability 0.02 --scenario single --scenario single-hedged`.
+# Results are written as JSON so that two versions can be compared with `--baseline`.
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import unisat
+from mock_server import MockServer
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('coalesce', False)
+    return unisat.Client(endpoint=server.url, api_key='0' * 64, log_config=None,
+                         log_level=logging.WARNING, **kwargs)
+
+def timed(function):
+    def wrapper(*args):
+        started = time.perf_counter()
+        result = function(*args)
+        return (result, time.perf_counter() - started)
+    return wrapper
+
+def single_calls(server, args, keep_alive=True, hedge_policy=None):
+    latencies = []
+    with make_client(server, keep_alive=keep_alive, hedge_policy=hedge_policy) as client:
+        for _ in range(args.calls):
+            (_, elapsed) = timed(client.uds.general.get_blockchain_info)()
+            latencies.append(elapsed)
+    return {'operations': args.calls, 'latencies': latencies}
+
+def paginated_sweep(server, args, prefetch=False):
+    latencies = []
+    with make_client(server) as client:
+        client.metrics.add_hook(lambda event: event['event'] == 'request'
+                                and latencies.append(event['latency']))
+        rows = sum(1 for _ in client.uds.brc20.iter_brc20_holders('ordi', limit=args.page,
+                                                                 prefetch=prefetch))
+    return {'operations': rows, 'latencies': latencies}
+
+def bulk_map(server, args):
+    txids = [f'{i:064x}' for i in range(args.calls)]
+    with make_client(server, pool_maxsize=args.workers) as client:
+        results = client.map(timed(client.uds.general.get_tx_info), txids)
+    latencies = [result[1] for result in results if not isinstance(result, Exception)]
+    return {'operations': len(txids), 'latencies': latencies}
+
+def bulk_async(server, args):
+    txids = [f'{i:064x}' for i in range(args.calls)]
+
+    async def run():
+        async with unisat.AsyncClient(endpoint=server.url, api_key='0' * 64, log_config=None,
+                                      max_concurrency=args.workers, coalesce=False) as client:
+            async def get(txid):
+                started = time.perf_counter()
+                await client.uds.general.get_tx_info(txid)
+                return time.perf_counter() - started
+            return await asyncio.gather(*(get(txid) for txid in txids))
+
+    return {'operations': len(txids), 'latencies': list(asyncio.run(run()))}
+
+SCENARIOS = {
+    'single': single_calls,
+    'single-no-keep-alive': lambda server, args: single_calls(server, args, keep_alive=False),
+    'single-hedged': lambda server, args: single_calls(
+        server, args, hedge_policy=unisat.HedgePolicy(budget=0.1, min_samples=10)),
+    'paginated': paginated_sweep,
+    'paginated-prefetch': lambda server, args: paginated_sweep(server, args, prefetch=True),
+    'bulk-map': bulk_map,
+    'bulk-async': bulk_async,
+}
+
+def run_scenario(name, server, args):
+    server.reset_stats()
+    started = time.perf_counter()
+    outcome = SCENARIOS[name](server, args)
+    elapsed = time.perf_counter() - started
+    stats = server.stats()
+    # second pass with tracemalloc, which would distort the timings
+    tracemalloc.start()
+    SCENARIOS[name](server, args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latencies = outcome['latencies']
+    return {
+        'scenario': name,
+        'operations': outcome['operations'],
+        'seconds': elapsed,
+        'throughput': outcome['operations'] / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'requests': stats['requests'],
+        'connections': stats['connections'],
+        'peak_mib': peak / 2 ** 20,
+    }
+
+def compare(results, baseline):
+    previous = {r['scenario']: r for r in baseline['results']}
+    print(f'\n{"scenario":<22} {"throughput":>12} {"p50":>10} {"p99":>10} {"memory":>10}')
+    for r in results:
+        old = previous.get(r['scenario'])
+        if old is None:
+            continue
+        ratios = []
+        for key in ('throughput', 'p50_ms', 'p99_ms', 'peak_mib'):
+            if r[key] is None or not old[key]:
+                ratios.append('-')
+            else:
+                ratios.append(f'{(r[key] / old[key] - 1) * 100:+.1f}%')
+        print(f'{r["scenario"]:<22} {ratios[0]:>12} {ratios[1]:>10} {ratios[2]:>10} '
+              f'{ratios[3]:>10}')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.005, help='server latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='server jitter (s)')
+    parser.add_argument('--slow-probability', type=float, default=0.0,
+                        help='ratio of slow responses')
+    parser.add_argument('--slow-latency', type=float, default=0.5,
+                        help='latency added to slow responses (s)')
+    parser.add_argument('--calls', type=int, default=500, help='calls per call scenario')
+    parser.add_argument('--rows', type=int, default=20000, help='holders of the swept ticker')
+    parser.add_argument('--page', type=int, default=500, help='page size of the sweep')
+    parser.add_argument('--workers', type=int, default=16, help='bulk concurrency')
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='scenario to run, can be repeated (default: all)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    args = parser.parse_args()
+
+    results = []
+    with MockServer(latency=args.latency, jitter=args.jitter, total=args.rows,
+                    max_page=args.page, slow_probability=args.slow_probability,
+                    slow_latency=args.slow_latency) as server:
+        for name in args.scenario or list(SCENARIOS):
+            results.append(run_scenario(name, server, args))
+
+    print(f'{"scenario":<22} {"ops":>7} {"ops/s":>10} {"p50 ms":>8} {"p99 ms":>8} '
+          f'{"requests":>9} {"conns":>6} {"peak MiB":>9}')
+    for r in results:
+        print(f'{r["scenario"]:<22} {r["operations"]:>7} {r["throughput"]:>10.1f} '
+              f'{r["p50_ms"] or 0:>8.2f} {r["p99_ms"] or 0:>8.2f} {r["requests"]:>9} '
+              f'{r["connections"]:>6} {r["peak_mib"]:>9.2f}')
+
+    report = {
+        'version': unisat.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_backend': unisat.codec.BACKEND,
+        'parameters': {k: v for k, v in vars(args).items() if k not in ('output', 'baseline')},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
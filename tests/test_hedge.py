@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import unisat
+from mock_server import MockServer
+
+CALLS = 40
+
+class HedgeRateLimitTest(unittest.TestCase):
+    """
+    Hedged calls with a rate limiter against a server with slow responses: a hedge
+    refused by the budget must not take a token of the rate limiter.
+    """
+
+    def setUp(self):
+        self.server = MockServer(slow_probability=0.5, slow_latency=0.1, seed=1)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.options = {
+            'log_config': None,
+            'rate_limiter': unisat.RateLimiter(1000),
+            'hedge_policy': unisat.HedgePolicy(delay=0.02, budget=0.1, burst=1),
+        }
+
+    def check(self, options):
+        hedges = options['hedge_policy'].stats()
+        self.assertGreater(hedges['hedges'], 0)
+        self.assertGreater(hedges['budget_exhausted'], 0)
+        self.assertEqual(self.server.requests, CALLS + hedges['hedges'])
+        self.assertEqual(options['rate_limiter'].stats()['calls'], self.server.requests)
+
+    def test_client(self):
+        with unisat.Client(self.server.url, '0' * 64, **self.options) as client:
+            for i in range(CALLS):
+                client.uds.general.get_tx_info(f'{i:064x}')
+        self.check(self.options)
+
+    def test_async_client(self):
+        async def main():
+            async with unisat.AsyncClient(self.server.url, '0' * 64, **self.options) as client:
+                for i in range(CALLS):
+                    await client.uds.general.get_tx_info(f'{i:064x}')
+        asyncio.run(main())
+        self.check(self.options)
+
+if __name__ == '__main__':
+    unittest.main()
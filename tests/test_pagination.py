@@ -0,0 +1,61 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import unisat
+from mock_server import BEST_HEIGHT
+from mock_server import MockServer
+
+class PaginationTest(unittest.TestCase):
+    """
+    The `iter_` methods against a server returning at most `max_page` records per page.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockServer(total=2000, max_page=500)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.client = unisat.Client(self.server.url, '0' * 64, log_config=None)
+        self.addCleanup(self.client.close)
+
+    def test_capped_pages_with_total(self):
+        holders = list(self.client.uds.brc20.iter_brc20_holders('ordi', limit=1000))
+        self.assertEqual(len(holders), 2000)
+        self.assertEqual(len({holder['address'] for holder in holders}), 2000)
+
+    def test_capped_pages_without_total(self):
+        txs = list(self.client.uds.general.iter_block_transactions(BEST_HEIGHT, size=1000))
+        self.assertEqual(len(txs), 2000)
+
+    def test_capped_pages_with_prefetch(self):
+        utxo = list(self.client.uds.general.iter_btc_utxo('bc1q', size=1000, prefetch=True))
+        self.assertEqual(len(utxo), 2000)
+
+    def test_short_list_without_total(self):
+        # 2 inputs: one page, then an empty one
+        before = self.server.requests
+        inputs = list(self.client.uds.general.iter_tx_inputs('00' * 32, size=100))
+        self.assertEqual(len(inputs), 2)
+        self.assertEqual(self.server.requests - before, 2)
+
+    def test_async_client(self):
+        client = unisat.AsyncClient(self.server.url, '0' * 64, log_config=None)
+        self.addCleanup(client.close)
+        with self.assertRaises(TypeError):
+            client.uds.brc20.iter_brc20_holders('ordi')
+        with self.assertRaises(TypeError):
+            client.uds.general.iter_tx_inputs('00' * 32)
+        response = asyncio.run(client.uds.brc20.get_brc20_holders('ordi', 0, 10))
+        self.assertEqual(len(response['data']['detail']), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import mock_server
+import unisat
+from mock_server import BEST_HEIGHT
+from mock_server import MockServer
+
+class SyncReorgTest(unittest.TestCase):
+    """
+    A SyncEngine behind a response cache while the server replaces its last blocks.
+    """
+
+    def setUp(self):
+        self.server = MockServer(total=20)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.client = unisat.Client(self.server.url, '0' * 64, log_config=None,
+                                    cache=unisat.ResponseCache())
+        self.addCleanup(self.client.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = unisat.JSONCheckpoint(os.path.join(directory.name, 'sync.json'))
+
+    def replace_blocks(self):
+        # every block hash and txid of the server changes
+        original = mock_server._hash
+        mock_server._hash = lambda *parts: original('replaced', *parts)
+        self.addCleanup(setattr, mock_server, '_hash', original)
+
+    def test_rolled_back_blocks_are_not_served_from_cache(self):
+        records, rollbacks = [], []
+        engine = unisat.SyncEngine(self.client, self.checkpoint, records.extend,
+                                   BEST_HEIGHT - 2, reorg_depth=2,
+                                   on_rollback=rollbacks.append)
+        self.assertEqual(engine.run_once(), 3)
+        old_txids = {record.record['txid'] for record in records}
+        records.clear()
+        self.replace_blocks()
+        self.assertEqual(engine.run_once(), 2)
+        self.assertEqual(rollbacks, [BEST_HEIGHT - 1])
+        self.assertEqual({record.height for record in records},
+                         {BEST_HEIGHT - 1, BEST_HEIGHT})
+        self.assertEqual(len(records), 40)
+        self.assertFalse(old_txids & {record.record['txid'] for record in records})
+        self.assertNotIn('refetch', engine.state)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import mock_server
+import unisat
+from mock_server import BEST_HEIGHT
+from mock_server import MockServer
+
+class WatcherReplacedTipTest(unittest.TestCase):
+    """
+    A BlockWatcher behind a response cache while the server replaces its tip.
+    """
+
+    def setUp(self):
+        self.server = MockServer(total=20)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.client = unisat.Client(self.server.url, '0' * 64, log_config=None,
+                                    cache=unisat.ResponseCache())
+        self.addCleanup(self.client.close)
+
+    def replace_blocks(self):
+        # every block hash and txid of the server changes
+        original = mock_server._hash
+        mock_server._hash = lambda *parts: original('replaced', *parts)
+        self.addCleanup(setattr, mock_server, '_hash', original)
+
+    def test_replaced_tip_is_not_served_from_cache(self):
+        blocks, history = [], []
+        watcher = unisat.BlockWatcher(self.client, start_height=BEST_HEIGHT)
+        watcher.watch_blocks(blocks.append)
+        watcher.watch_ticker('ordi', history.append)
+        self.assertEqual(watcher.poll(), 1)
+        old_txids = {event.record['txid'] for events in blocks + history for event in events}
+        (blocks[:], history[:]) = ([], [])
+        self.replace_blocks()
+        self.assertEqual(watcher.poll(), 1)
+        self.assertEqual(watcher.height, BEST_HEIGHT)
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(len(history), 1)
+        txids = {event.record['txid'] for events in blocks + history for event in events}
+        self.assertEqual(len(txids), 40)
+        self.assertFalse(old_txids & txids)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,21 @@
-from .brc20 import BRC20
-from .general import General
+from .pagination import disable_iterators
 
 class UDS:
     def __init__(self, client):
-        self.brc20 = BRC20(client)
-        self.general = General(client)
\ No newline at end of file
+        self.client = client
+
+    def __getattr__(self, name):
+        # modules are imported and built on first use, then kept as attributes
+        if name == 'brc20':
+            from .brc20 import BRC20
+            module = BRC20(self.client)
+        elif name == 'general':
+            from .general import General
+            module = General(self.client)
+        else:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        import inspect
+        if inspect.iscoroutinefunction(self.client.call):
+            disable_iterators(module)
+        setattr(self, name, module)
+        return module
\ No newline at end of file
@@ -1,3 +1,6 @@
+from ..routes import ROUTES
+from .pagination import paginate
+
 class BRC20:
     ''' Implementation of BRC20 Module of UniSat API (from UDS documentations)
     see: https://docs.unisat.io/dev/unisat-developer-service/brc-20
@@ -11,8 +14,7 @@ class BRC20:
         This value will be consistend with the latest block height a short
         time after the block has been confirmed.
         '''
-        route = '/v1/indexer/brc20/bestheight'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_best_block_height'].build())
 
     def get_brc20_list(self, start, limit):
         """Get the ticker list of BRC20 token.
@@ -21,9 +23,17 @@ class BRC20:
             limit (int): Number of inscriptions returned
             start (int): Start offset
         """
-        route = '/v1/indexer/brc20/list'
-        params = {'limit': limit, 'start': start}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_brc20_list'].build(start, limit))
+
+    def iter_brc20_list(self, limit=100, prefetch=False):
+        """Iterate over all BRC20 tickers, page by page.
+
+        Parameters:
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        """
+        fetch = lambda start, limit: self.get_brc20_list(start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_brc20_info(self, ticker):
         '''Get the information of BRC20 by ticker.
@@ -31,8 +41,7 @@ class BRC20:
         Parameters:
             ticker (str): Token ticker
         '''
-        route = f'/v1/indexer/brc20/{ticker}/info'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_brc20_info'].build(ticker))
 
     def get_brc20_holders(self, ticker, start, limit):
         '''Get the holders of BRC20 by ticker.
@@ -42,9 +51,18 @@ class BRC20:
             start (int): Start offset
             limit (int): Number of returned
         '''
-        route = f'/v1/indexer/brc20/{ticker}/holders'
-        params = {'limit': limit, 'start': start}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_brc20_holders'].build(ticker, start, limit))
+
+    def iter_brc20_holders(self, ticker, limit=100, prefetch=False):
+        '''Iterate over all holders of a BRC20 ticker, page by page.
+
+        Parameters:
+            ticker (str): Token ticker
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda start, limit: self.get_brc20_holders(ticker, start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_brc20_history(self, ticker, type_, height, start, limit):
         ''' Get the full history of BRC20
@@ -56,9 +74,21 @@ class BRC20:
             start (int): Start offset
             limit (int): Nuber of inscriptions returned
         '''
-        route = f'/v1/indexer/brc20/{ticker}/history'
-        params = {'type': type_, 'height': height, 'start': start, 'limit':limit}
-        return self.client.call(method='GET', route=route, params=params)
+        request = ROUTES['get_brc20_history'].build(ticker, type_, height, start, limit)
+        return self.client.call(*request)
+
+    def iter_brc20_history(self, ticker, type_, height, limit=100, prefetch=False):
+        '''Iterate over the full history of a BRC20 ticker, page by page.
+
+        Parameters:
+            ticker (str): Token ticker
+            type_ (str): Filter by history type
+            height (int): Block height
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda start, limit: self.get_brc20_history(ticker, type_, height, start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_brc20_tx_history(self, ticker, txid, type_, start, limit):
         """Get the full history of BRC20 by address.
@@ -70,9 +100,21 @@ class BRC20:
             start (int): Start offset
             type_ (str): Filter by history type
         """
-        route = f'/v1/indexer/brc20/{ticker}/tx/{txid}/history'
-        params = {'limit': limit, 'start': start, 'type': type_}
-        return self.client.call(method='GET', route=route, params=params)
+        request = ROUTES['get_brc20_tx_history'].build(ticker, txid, type_, start, limit)
+        return self.client.call(*request)
+
+    def iter_brc20_tx_history(self, ticker, txid, type_, limit=100, prefetch=False):
+        """Iterate over the history of a BRC20 ticker in a tx, page by page.
+
+        Parameters:
+            ticker (str): Token ticker
+            txid (str): txid
+            type_ (str): Filter by history type
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        """
+        fetch = lambda start, limit: self.get_brc20_tx_history(ticker, txid, type_, start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_address_brc20_summary(self, address, start, limit):
         """Obtain BRC20 token summary by address,
@@ -88,9 +130,18 @@ class BRC20:
             limit (int): Number of inscriptions returned
             start (int): Start offset
         """
-        route = f'/v1/indexer/address/{address}/brc20/summary'
-        params = {'start': start, 'limit': limit}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_address_brc20_summary'].build(address, start, limit))
+
+    def iter_address_brc20_summary(self, address, limit=100, prefetch=False):
+        """Iterate over the BRC20 token summary of an address, page by page.
+
+        Parameters:
+            address (str): Address
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        """
+        fetch = lambda start, limit: self.get_address_brc20_summary(address, start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_address_brc20_ticker_info(self, address, ticker):
         '''Obtain BRC20 token information by address, including availale balance, transferable
@@ -100,8 +151,7 @@ class BRC20:
             address (str): Address
             ticker (str): Token ticker
         '''
-        route = f'/v1/indexer/address/{address}/brc20/{ticker}/info'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_address_brc20_ticker_info'].build(address, ticker))
 
     def get_address_brc20_history(self, address, ticker, type_, start, limit):
         '''Get the full history of BRC20 by address.
@@ -113,9 +163,22 @@ class BRC20:
             start (integer): Start offset
             type_ (str): Filter by history type
         '''
-        route = f'/v1/indexer/address/{address}/brc20/{ticker}/history'
-        params = {'limit': limit, 'start': start, 'type':type_}
-        return self.client.call(method='GET', route=route, params=params)
+        request = ROUTES['get_address_brc20_history'].build(address, ticker, type_, start, limit)
+        return self.client.call(*request)
+
+    def iter_address_brc20_history(self, address, ticker, type_, limit=100, prefetch=False):
+        '''Iterate over the full history of BRC20 by address, page by page.
+
+        Parameters:
+            address (str): Address
+            ticker (str): Token ticker
+            type_ (str): Filter by history type
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda start, limit: self.get_address_brc20_history(address, ticker, type_,
+                                                                    start, limit)
+        return paginate(fetch, 0, limit, prefetch)
 
     def get_transferable_inscription(self, address, ticker, start, limit):
         '''Get the transferable inscriptions list of BRC20 by address.
@@ -126,6 +189,18 @@ class BRC20:
             start (int): Start offset
             limit (int): Number of inscriptions returned
         '''
-        route = f'/v1/indexer/address/{address}/brc20/{ticker}/transferable-inscriptions'
-        params = {'start': start, 'limit': limit}
-        return self.client.call(method='GET', route=route, params=params)
+        request = ROUTES['get_transferable_inscription'].build(address, ticker, start, limit)
+        return self.client.call(*request)
+
+    def iter_transferable_inscription(self, address, ticker, limit=100, prefetch=False):
+        '''Iterate over the transferable inscriptions of BRC20 by address, page by page.
+
+        Parameters:
+            address (str): Address
+            ticker (str): Token ticker
+            limit (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda start, limit: self.get_transferable_inscription(address, ticker,
+                                                                       start, limit)
+        return paginate(fetch, 0, limit, prefetch)
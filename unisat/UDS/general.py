@@ -1,3 +1,6 @@
+from ..routes import ROUTES
+from .pagination import paginate
+
 class General:
     ''' Implementation of general Module of UniSat API (from UDS documentations)
     see: https://docs.unisat.io/dev/unisat-developer-service/general
@@ -9,8 +12,7 @@ class General:
     # Blocks
     def get_blockchain_info(self):
         """Get blockchain info."""
-        route = '/v1/indexer/blockchain/info'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_blockchain_info'].build())
 
     def get_block_transactions(self, height, cursor, size):
         '''Get tx history by block height.
@@ -20,9 +22,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/block/{height}/txs'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_block_transactions'].build(height, cursor, size))
+
+    def iter_block_transactions(self, height, size=100, prefetch=False):
+        '''Iterate over all txs of a block, page by page.
+
+        Parameters:
+            height (int): Block height
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_block_transactions(height, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     # Transactions
     def get_tx_info(self, txid):
@@ -31,8 +42,7 @@ class General:
         Parameters:
             txid (str): Tx id
         '''
-        route = f'/v1/indexer/tx/{txid}'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_tx_info'].build(txid))
 
     def get_tx_inputs(self, txid, cursor, size):
         '''Get the inputs of a tx.
@@ -42,9 +52,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/tx/{txid}/ins'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_tx_inputs'].build(txid, cursor, size))
+
+    def iter_tx_inputs(self, txid, size=100, prefetch=False):
+        '''Iterate over all inputs of a tx, page by page.
+
+        Parameters:
+            txid (str): Tx id
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_tx_inputs(txid, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     def get_tx_outputs(self, txid, cursor, size):
         '''Get the outputs of a tx.
@@ -54,9 +73,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/tx/{txid}/outs'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_tx_outputs'].build(txid, cursor, size))
+
+    def iter_tx_outputs(self, txid, size=100, prefetch=False):
+        '''Iterate over all outputs of a tx, page by page.
+
+        Parameters:
+            txid (str): Tx id
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_tx_outputs(txid, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     # Addresses
     def get_address_balance(self, address):
@@ -65,8 +93,7 @@ class General:
         Parameters:
             address (str): Address
         '''
-        route = f'/v1/indexer/address/{address}/balance'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_address_balance'].build(address))
 
     def get_address_history(self, address, cursor, size):
         '''Get the tx history by address.
@@ -76,9 +103,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/address/{address}/history'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_address_history'].build(address, cursor, size))
+
+    def iter_address_history(self, address, size=100, prefetch=False):
+        '''Iterate over the whole tx history of an address, page by page.
+
+        Parameters:
+            address (str): Address
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_address_history(address, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     def get_btc_utxo(self, address, cursor, size):
         '''Get non inscription UTXO list by address
@@ -88,9 +124,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/address/{address}/utxo-data'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_btc_utxo'].build(address, cursor, size))
+
+    def iter_btc_utxo(self, address, size=100, prefetch=False):
+        '''Iterate over all non inscription UTXO of an address, page by page.
+
+        Parameters:
+            address (str): Address
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_btc_utxo(address, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     def get_inscription_utxo(self, address, cursor, size):
         '''Get inscription UTXO list by address
@@ -100,9 +145,18 @@ class General:
             cursor (int): Start offset
             size (int): Number of items returned
         '''
-        route = f'/v1/indexer/address/{address}/inscription-utxo-data'
-        params = {'cursor': cursor, 'size': size}
-        return self.client.call(method='GET', route=route, params=params)
+        return self.client.call(*ROUTES['get_inscription_utxo'].build(address, cursor, size))
+
+    def iter_inscription_utxo(self, address, size=100, prefetch=False):
+        '''Iterate over all inscription UTXO of an address, page by page.
+
+        Parameters:
+            address (str): Address
+            size (int): Number of items requested per page
+            prefetch (bool): Request the next page while the current one is consumed
+        '''
+        fetch = lambda cursor, size: self.get_inscription_utxo(address, cursor, size)
+        return paginate(fetch, 0, size, prefetch)
 
     # Inscriptions
     def get_inscription_info(self, inscription_id):
@@ -111,5 +165,4 @@ class General:
         Parameters:
             inscriptionid (str):
         '''
-        route = f'/v1/indexer/inscription/info/{inscription_id}'
-        return self.client.call(method='GET', route=route)
+        return self.client.call(*ROUTES['get_inscription_info'].build(inscription_id))
@@ -0,0 +1,105 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+RECORD_KEYS = ('detail', 'utxo')
+
+def get_records(data):
+    '''Extract the list of records from the `data` field of a paginated response.
+
+    Depending on the endpoint, records are returned directly as a list or under
+    the `detail` / `utxo` keys of a dict.
+
+    Parameters:
+        data (list|dict): The `data` field of the API response
+    '''
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in RECORD_KEYS:
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+def get_total(data):
+    '''Extract the total number of records reported by a paginated response, if any.
+
+    Parameters:
+        data (list|dict): The `data` field of the API response
+    '''
+    if isinstance(data, dict) and isinstance(data.get('total'), int):
+        return data['total']
+    return None
+
+def paginate(fetch, start=0, size=100, prefetch=False):
+    '''Lazily walk a start/limit or cursor/size endpoint and yield its records one by one.
+
+    When the response reports a total, the walk goes on until it is reached or a page
+    comes back empty, the server being allowed to return fewer records than requested.
+    Without a total, it stops on an empty page or on a page shorter than the longest
+    one received, the first page being followed by a request for the next one unless it
+    is empty.
+    When `prefetch` is set, the next page is requested on a background thread
+    while the records of the current page are being consumed.
+
+    Parameters:
+        fetch (callable): fetch(offset, size) returning the API response of one page
+        start (int): Start offset
+        size (int): Number of items requested per page
+        prefetch (bool): Request the next page ahead of time
+    '''
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offset = start
+        pending = None
+        longest = 0
+        while True:
+            page = pending.result() if pending else fetch(offset, size)
+            pending = None
+            data = page.get('data')
+            records = get_records(data)
+            total = get_total(data)
+            offset += len(records)
+            if total is not None:
+                more = bool(records) and offset < total
+            else:
+                more = bool(records) and len(records) >= longest
+                longest = max(longest, len(records))
+            if more and executor:
+                pending = executor.submit(fetch, offset, size)
+            yield from records
+            if not more:
+                return
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+def paginate_route(client, route, args=(), size=100, prefetch=False, use_cache=True):
+    '''Walk a paginated route of `unisat.routes.ROUTES` with `client.call()`, like the
+    `iter_` methods, with the call options they do not expose.
+
+    Parameters:
+        client (Client): The client used to call the API
+        route (Route): The route, whose offset and page size are its last parameters
+        args (tuple): The other parameters of the route, in order
+        size (int): Number of items requested per page
+        prefetch (bool): Request the next page ahead of time
+        use_cache (bool): Look for the pages in the response cache
+    '''
+    fetch = lambda offset, size: client.call(*route.build(*args, offset, size),
+                                             use_cache=use_cache)
+    return paginate(fetch, 0, size, prefetch)
+
+def disable_iterators(module):
+    '''Replace the `iter_` methods of a module built for an asyncio client, whose `get_`
+    methods return awaitables, by functions raising a TypeError.
+
+    Parameters:
+        module (object): A UDS module instance
+    '''
+    for name in dir(type(module)):
+        if name.startswith('iter_'):
+            setattr(module, name, functools.partial(_not_available, name))
+
+def _not_available(name, *args, **kwargs):
+    raise TypeError(f'{name}() is not available with unisat.AsyncClient(), '
+                    'call the get_ method with explicit offsets instead')
@@ -1,3 +1,5 @@
+import importlib
+
 # Package information
 __title__           = "unisat-connector-python"
 __version__         = "0.0.42"
@@ -14,13 +16,53 @@ __classifiers__     = [
     "License :: OSI Approved :: BSD License",
     "Operating System :: OS Independent",
     "Programming Language :: Python :: 3",
-    "Programming Language :: Python :: 3.6",
+    "Programming Language :: Python :: 3.7",
     "Topic :: Software Development :: Libraries :: Python Modules"
 ]
 
-# Expose
-from .client import Client
-from .client import ClientError
+# Expose, each name being imported on first use so that `import unisat` stays cheap
+_EXPORTS = {
+    'Client': '.client',
+    'AsyncClient': '.async_client',
+    'ClientError': '.client',
+    'Response': '.response',
+    'RateLimiter': '.ratelimit',
+    'RetryPolicy': '.retry',
+    'Metrics': '.metrics',
+    'CircuitBreaker': '.failover',
+    'EndpointPool': '.failover',
+    'HedgePolicy': '.hedge',
+    'PortfolioEngine': '.portfolio',
+    'WalletPortfolio': '.portfolio',
+    'SyncEngine': '.sync',
+    'SyncRecord': '.sync',
+    'JSONCheckpoint': '.sync',
+    'SqliteCheckpoint': '.sync',
+    'BlockWatcher': '.watcher',
+    'WatchEvent': '.watcher',
+    'NDJSONSink': '.export',
+    'CSVSink': '.export',
+    'ArrowSink': '.export',
+    'ParquetSink': '.export',
+    'ResponseCache': '.cache',
+    'CacheRule': '.cache',
+    'MemoryBackend': '.cache',
+    'SqliteBackend': '.cache',
+    'ObjectStore': '.store',
+}
+
+__all__ = list(_EXPORTS) + ['TESTNET', 'MAINNET', 'WHITELIST']
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
 # Constants
 TESTNET = "https://open-api-testnet.unisat.io"
@@ -0,0 +1,258 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .client import BaseClient
+from .client import ClientError
+
+class AsyncClient(BaseClient):
+    """
+    An asyncio client class for interacting with the UniSat Developer Service API.
+
+    This class exposes the same `uds.general` / `uds.brc20` methods as `Client`, each of
+    them returning an awaitable. HTTP requests run on a bounded pool of worker threads
+    sharing the pooled session, so one event loop can keep many calls in flight.
+    """
+
+    def __init__(self, endpoint, api_key, log_config='stderr', log_level=logging.INFO,
+                 max_concurrency=100, **kwargs):
+        """
+        Initialize the AsyncClient instance.
+
+        Parameters:
+            endpoint (str): The base URL of the API.
+            api_key (str): The bearer token for API authentication.
+            log_config (str): Configuration for the logging output.
+            log_level (int): The logging level.
+            max_concurrency (int, optional): Maximum number of API calls in flight.
+                                             Defaults to 100.
+            **kwargs: Connection pool options, see `Client`.
+        """
+        kwargs.setdefault('pool_maxsize', max_concurrency)
+        super().__init__(endpoint, api_key, log_config, log_level, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._semaphore = None
+
+    async def __aenter__(self):
+        """
+        Enter the asynchronous runtime context related to this object.
+
+        Returns:
+            AsyncClient: The instance of the AsyncClient itself.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the asynchronous runtime context and perform any necessary cleanup.
+
+        Parameters:
+            exc_type (type): type of the exception that caused the context to be exited, if any.
+            exc_value (Exception): exception instance that caused the context to be exited, if any.
+            exc_traceback (traceback): traceback object associated with the exception, if any.
+
+        Returns:
+            bool: False to indicate any exception passed to it should be re-raised.
+        """
+        self._shutdown(exc_type, exc_value)
+        return False
+
+    def close(self):
+        """
+        Close every pooled connection and stop the worker threads.
+
+        The client can still be used afterwards, new threads and connections will be
+        started on demand.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        super().close()
+
+    def _get_executor(self):
+        """
+        Returns:
+            ThreadPoolExecutor: The threads sending the requests, created on first use.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix='unisat')
+            return self._executor
+
+    async def call(self, method='GET', route='/', params=None, use_cache=True):
+        """
+        Make an API call to the specified route using the given method and parameters.
+
+        This coroutine has the same semantics as `Client.call`: it retries failed attempts
+        according to the retry policy and raises a ClientError for unsuccessful responses.
+
+        Parameters:
+            method (str, optional): The HTTP method to use for the request. Defaults to 'GET'.
+            route (str, optional): The API route to be accessed. Defaults to '/'.
+            params (dict, optional): The parameters to be sent with the request. Defaults to None.
+            use_cache (bool, optional): Look for the response in the response cache.
+                                        False fetches it from the API, the cache being
+                                        updated with it. Defaults to True.
+
+        Returns:
+            Response: The JSON response content from the API, usable as a dict.
+
+        Raises:
+            ClientError: If the API response is not successful.
+        """
+        cached = self._store_lookup(method, route, params)
+        if cached is None and use_cache:
+            cached = self._cache_lookup(method, route, params)
+        if cached is not None:
+            return cached
+        key = self._coalescing_key(method, route, params)
+        if key is None:
+            return await self._call_api(method, route, params)
+        return await self.singleflight.do_async(key, lambda: self._call_api(method, route, params))
+
+    async def _call_api(self, method, route, params):
+        """
+        Sends an API call to the network, retrying failed attempts.
+
+        Parameters:
+            method (str): The HTTP method to use for the request.
+            route (str): The API route to be accessed.
+            params (dict): The parameters to be sent with the request.
+
+        Returns:
+            Response: The JSON response content from the API, usable as a dict.
+
+        Raises:
+            ClientError: If the API response is not successful.
+        """
+        request = self._configure_request(method, route, params)
+        started = time.monotonic()
+        attempt, waited = 0, 0.0
+        while True:
+            attempt += 1
+            timeout = None
+            if await self._wait_rate_limiter(started):
+                timeout = self._attempt_timeout(started)
+            if timeout is None:
+                if attempt == 1:
+                    (content, error) = (None, self._deadline_error())
+                break
+            try:
+                content, error = await self._send_request_async(*request, timeout), None
+            except ClientError as exc:
+                content, error = None, exc
+            delay = self._retry_delay(request[0], attempt, started, content, error)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            waited += delay
+        return self._finish_call(method, route, params, content, error, attempt, waited)
+
+    async def _wait_rate_limiter(self, started):
+        """
+        Suspends until the rate limiter, if any, allows the next attempt of a call.
+        Same semantics as `Client._wait_rate_limiter`.
+
+        Returns:
+            bool: False if the deadline of the retry policy would pass first.
+        """
+        if self.rate_limiter is None:
+            return True
+        left = self._time_left(started)
+        if left is not None and left <= 0:
+            return False
+        wait = await self.rate_limiter.acquire_async(left)
+        if wait is None:
+            return False
+        self._observe_rate_limiter_wait(wait)
+        return True
+
+    def _get_semaphore(self, loop):
+        """
+        Returns:
+            asyncio.Semaphore: The semaphore bounding the calls in flight on `loop`,
+                               created again when the client is used from another loop
+                               (e.g. a second `asyncio.run()`).
+        """
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._semaphore[1]
+
+    async def _send_request_async(self, method, url, headers, data, timeout=None):
+        """
+        Sends an API request on a worker thread without blocking the event loop.
+
+        Parameters:
+            method (str): The HTTP method for the request.
+            url (str): The full URL for the request.
+            headers (dict): Headers to be sent with the request.
+            data (str): Stringified JSON data to be sent with the request (if applicable).
+            timeout (tuple, optional): The (connect, read) timeouts of each request.
+
+        Returns:
+            Response: The response content and the HTTP status code.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            if self._is_hedgeable(method):
+                return await self._send_hedged_async(loop, (method, url, headers, data),
+                                                     timeout)
+            dispatch = functools.partial(self._dispatch, method, url, headers, data,
+                                         timeout=timeout)
+            return await loop.run_in_executor(self._get_executor(), dispatch)
+
+    async def _send_hedged_async(self, loop, request, timeout=None):
+        """
+        Sends an API request, and a second one if the hedge policy finds the first slow.
+        Same semantics as `Client._send_hedged`.
+
+        Parameters:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            request (tuple): The method, URL, headers and data of the request.
+            timeout (tuple, optional): The (connect, read) timeouts of each request.
+
+        Returns:
+            Response: The response content and the HTTP status code.
+
+        Raises:
+            ClientError: If every request sent failed.
+        """
+        delay = self.hedge_policy.start_call()
+        started, used = time.perf_counter(), []
+        first = loop.run_in_executor(self._get_executor(),
+                                     functools.partial(self._dispatch, *request, used=used,
+                                                       timeout=timeout))
+        first.add_done_callback(
+            lambda _: self.hedge_policy.observe(time.perf_counter() - started))
+        pending = {first}
+        (done, _) = await asyncio.wait(pending, timeout=delay)
+        if not done and self._acquire_hedge():
+            self.logger.debug('[HEDGE] %s %s after %.3f seconds', request[0], request[1], delay)
+            hedge = functools.partial(self._dispatch, *request, timeout=timeout,
+                                      **self._hedge_options(used))
+            pending.add(loop.run_in_executor(self._get_hedge_executor(), hedge))
+        content, error = None, None
+        while pending:
+            (done, pending) = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    answer = future.result()
+                except ClientError as exc:
+                    error = exc
+                    continue
+                if answer.http_status_code == 200:
+                    for other in pending:
+                        other.cancel()
+                    if future is not first:
+                        self.hedge_policy.record_win()
+                    return answer
+                content = answer
+        if content is None:
+            raise error
+        return content
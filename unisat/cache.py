@@ -0,0 +1,348 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .response import Response
+
+# Height reported by the API for txs still in the mempool
+UNCONFIRMED_HEIGHT = 4194303
+
+IMMUTABLE = 'immutable'
+BLOCK = 'block'
+
+class CacheRule:
+    """
+    Caching policy of the routes matching a regular expression.
+
+    Scopes:
+        - IMMUTABLE: the response never changes once confirmed, it is kept until evicted.
+        - BLOCK: the response is valid until a new block height is observed.
+        - None: the response is only kept for `ttl` seconds.
+    """
+
+    def __init__(self, pattern, scope=None, ttl=None):
+        """
+        Initialize the CacheRule instance.
+
+        Parameters:
+            pattern (str): Regular expression matched against the route.
+            scope (str, optional): IMMUTABLE, BLOCK or None.
+            ttl (float, optional): Maximum age of an entry in seconds, None for no limit.
+                                   A rule with neither scope nor ttl disables caching.
+        """
+        self.pattern = re.compile(pattern)
+        self.scope = scope
+        self.ttl = ttl
+
+    def is_cacheable(self):
+        """
+        Returns:
+            bool: False if the rule disables caching.
+        """
+        return self.scope is not None or bool(self.ttl)
+
+DEFAULT_RULES = [
+    CacheRule(r'^/v1/indexer/(blockchain/info|brc20/bestheight)$'),
+    CacheRule(r'^/v1/indexer/tx/[^/]+/(ins|outs)$', scope=IMMUTABLE),
+    CacheRule(r'^/v1/indexer/tx/[^/]+$', scope=IMMUTABLE),
+    CacheRule(r'^/v1/indexer/address/', scope=BLOCK, ttl=60),
+    CacheRule(r'^/v1/indexer/', scope=BLOCK, ttl=600),
+]
+
+class MemoryBackend:
+    """
+    In-memory LRU storage for cached responses, local to the process.
+    """
+
+    def __init__(self, max_entries=4096):
+        """
+        Parameters:
+            max_entries (int, optional): Maximum number of entries kept. Defaults to 4096.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._meta = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns:
+            dict: The value stored under `key`, None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            (value, expires) = entry
+            if expires is not None and expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores `value` under `key`, evicting the least recently used entries if needed.
+        """
+        expires = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_meta(self, name):
+        """
+        Returns:
+            str: The metadata stored under `name`, None if missing.
+        """
+        with self._lock:
+            return self._meta.get(name)
+
+    def set_meta(self, name, value):
+        """
+        Stores the metadata `value` under `name`.
+        """
+        with self._lock:
+            self._meta[name] = value
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+class SqliteBackend:
+    """
+    On-disk LRU storage for cached responses, shareable by several processes.
+    """
+
+    def __init__(self, path, max_entries=100000):
+        """
+        Parameters:
+            path (str): Path of the sqlite database file.
+            max_entries (int, optional): Maximum number of entries kept. Defaults to 100000.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, '
+                         'value TEXT NOT NULL, expires REAL, accessed REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+
+    def get(self, key):
+        """
+        Returns:
+            dict: The value stored under `key`, None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM entries WHERE key = ?',
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] < now:
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                return None
+            self._db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores `value` under `key`, evicting the least recently used entries if needed.
+        """
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                             (key, json.dumps(value), expires, now))
+            (count,) = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()
+            if count > self.max_entries:
+                self._db.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries '
+                                 'ORDER BY accessed LIMIT ?)', (count - self.max_entries,))
+
+    def get_meta(self, name):
+        """
+        Returns:
+            str: The metadata stored under `name`, None if missing.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        """
+        Stores the metadata `value` under `name`.
+        """
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (name, value))
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._db.execute('DELETE FROM entries')
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+class ResponseCache:
+    """
+    A cache of successful API responses keyed on method, route and parameters.
+
+    Block scoped entries are keyed on the last block heights observed through
+    `get_blockchain_info` and `get_best_block_height`, so they are invalidated as soon
+    as one of these calls reports a new height.
+    """
+
+    def __init__(self, backend=None, rules=None):
+        """
+        Initialize the ResponseCache instance.
+
+        Parameters:
+            backend (MemoryBackend|SqliteBackend, optional): Storage of the entries.
+                                                             Defaults to MemoryBackend().
+            rules (list, optional): CacheRule list, the first matching rule applies.
+                                    Defaults to DEFAULT_RULES.
+        """
+        self.backend = MemoryBackend() if backend is None else backend
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, method, route, params):
+        """
+        Looks for a cached response.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            route (str): The API route of the request.
+            params (dict): The parameters of the request.
+
+        Returns:
+            Response: The cached response content, None on a cache miss.
+        """
+        rule = self._get_rule(method, route)
+        if rule is None:
+            return None
+        content = self.backend.get(self._get_key(rule, method, route, params))
+        with self._lock:
+            if content is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return Response(content['http_status_code'], content,
+                        {'retry_stats': {'attempts': 0, 'wait': 0.0}})
+
+    def store(self, method, route, params, content):
+        """
+        Stores a response and records the block height it reports, if any.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            route (str): The API route of the request.
+            params (dict): The parameters of the request.
+            content (dict): The response content.
+        """
+        if content['http_status_code'] != 200 or content.get('code', 0) != 0:
+            return
+        self._observe_height(route, content.get('data'))
+        rule = self._get_rule(method, route)
+        if rule is None or not self._is_final(rule, content.get('data')):
+            return
+        value = {k: v for k, v in content.items() if k != 'retry_stats'}
+        self.backend.set(self._get_key(rule, method, route, params), value, rule.ttl)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of hits and misses and the hit ratio.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / total if total else 0.0,
+            }
+
+    def is_cacheable(self, method, route):
+        """
+        Returns:
+            bool: True if a rule caches the responses of the request, its lookups being
+                  counted as hits or misses.
+        """
+        return self._get_rule(method, route) is not None
+
+    def _get_rule(self, method, route):
+        """
+        Returns:
+            CacheRule: The rule applying to the request, None if it is not cacheable.
+        """
+        if method != 'GET':
+            return None
+        for rule in self.rules:
+            if rule.pattern.search(route):
+                return rule if rule.is_cacheable() else None
+        return None
+
+    def _get_key(self, rule, method, route, params):
+        """
+        Returns:
+            str: The cache key of the request, prefixed by the observed heights if block scoped.
+        """
+        items = '&'.join(f'{k}={v}' for k, v in sorted((params or {}).items()))
+        key = f'{method} {route}?{items}'
+        if rule.scope == BLOCK:
+            key = f'{self.backend.get_meta("heights")}|{key}'
+        return key
+
+    def _is_final(self, rule, data):
+        """
+        Returns:
+            bool: False for immutable routes returning a tx not confirmed yet.
+        """
+        if rule.scope != IMMUTABLE or not isinstance(data, dict) or 'height' not in data:
+            return True
+        return 0 < data['height'] < UNCONFIRMED_HEIGHT
+
+    def _observe_height(self, route, data):
+        """
+        Records the block heights reported by the blockchain info and BRC20 best height
+        routes, which invalidates every block scoped entry when one of them changes.
+        """
+        if not isinstance(data, dict):
+            return
+        if route == '/v1/indexer/blockchain/info':
+            (name, height) = ('blocks', data.get('blocks'))
+        elif route == '/v1/indexer/brc20/bestheight':
+            (name, height) = ('brc20', data.get('height'))
+        else:
+            return
+        if height is None:
+            return
+        heights = json.loads(self.backend.get_meta('heights') or '{}')
+        if heights.get(name) != height:
+            heights[name] = height
+            self.backend.set_meta('heights', json.dumps(heights, sort_keys=True))
@@ -1,10 +1,54 @@
 import sys
 import logging
+import threading
 import json
+import reprlib
 import time
-import requests
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from types import MappingProxyType
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from .retry import RetryPolicy
+from .retry import is_rate_limited
+from .failover import FAILURE_STATUSES
+from .failover import EndpointPool
+from .singleflight import SingleFlight
+from .metrics import Metrics
+from . import codec
+from .response import Response
 from .UDS import UDS
 
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Maximum number of characters of a payload written in DEBUG logs
+DEBUG_BODY_LIMIT = 512
+
+_debug_repr = reprlib.Repr()
+_debug_repr.maxlevel = 4
+_debug_repr.maxdict = _debug_repr.maxlist = 20
+_debug_repr.maxstring = _debug_repr.maxother = 100
+
+def _truncate(value, limit=None):
+    """
+    Returns the text representation of a value for DEBUG logs, truncated to `limit`
+    characters (defaults to `DEBUG_BODY_LIMIT`).
+    """
+    limit = DEBUG_BODY_LIMIT if limit is None else limit
+    if isinstance(value, (list, dict)):
+        # only the beginning is written, do not serialize the whole payload
+        text = _debug_repr.repr(value)
+    else:
+        text = str(value)
+    return text if len(text) <= limit else f'{text[:limit]}...[{len(text) - limit} more]'
+
+def _redact(headers):
+    """
+    Returns the text representation of request headers for logs, without the API key.
+    """
+    return str({k: ('Bearer ***' if k == 'Authorization' else v) for k, v in headers.items()})
+
 class ClientError(Exception):
     """
     Custom exception class for handling API-related errors.
@@ -33,71 +77,115 @@ class ClientError(Exception):
         if logger:
             logger.error(error_message, exc_info=log_exc_info)
 
-class Client:
+class BaseClient:
     """
-    A client class for interacting with the UniSat Developer Service API.
+    Base class shared by the synchronous and asynchronous UniSat clients.
 
-    This class provides methods for sending requests to the API, handling errors,
-    logging messages, and managing API calls.
+    This class holds the configuration, the request building, the HTTP transport,
+    the response checks and the logging, so that `Client` and `AsyncClient` only
+    differ in the way they schedule API calls.
     """
 
-    def __init__(self, endpoint, api_key, log_config='stderr', log_level=logging.INFO):
+    def __init__(self, endpoint, api_key, log_config='stderr', log_level=logging.INFO,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True,
+                 connect_timeout=5, read_timeout=30, rate_limiter=None, retry_policy=None,
+                 cache=None, coalesce=True, metrics=True, hedge_policy=None, store=None):
         """
         Initialize the Client instance with
             - API endpoint
             - Authentication details
-            - Logging configuration.
+            - Logging configuration
+            - HTTP connection pool configuration.
 
         Parameters:
-            endpoint (str): The base URL of the API.
+            endpoint (str|list|EndpointPool): The base URL of the API, or several of them
+                                              by order of preference to fail over between
+                                              them, each one with a circuit breaker.
             api_key (str): The bearer token for API authentication.
             log_config (str): Configuration for the logging output.
             log_level (int): The logging level.
+            pool_connections (int, optional): Number of per-host connection pools to cache.
+            pool_maxsize (int, optional): Maximum number of connections kept open per host.
+            pool_block (bool, optional): Wait for a free connection when the host pool is
+                                         exhausted instead of opening a throwaway one.
+            keep_alive (bool, optional): Reuse connections between calls. Defaults to True.
+            connect_timeout (float, optional): Seconds to wait for the TCP/TLS connection.
+            read_timeout (float, optional): Seconds to wait for the server response.
+            rate_limiter (RateLimiter, optional): Paces outgoing calls, can be shared between
+                                                  clients using the same API key.
+            retry_policy (RetryPolicy, optional): Decides which failed calls are retried.
+                                                  Defaults to RetryPolicy().
+            cache (ResponseCache, optional): Serves repeated calls without hitting the API.
+                                             Defaults to None (no cache).
+            coalesce (bool, optional): Send identical GET calls in flight only once, all the
+                                       callers getting the same response. Defaults to True.
+            metrics (bool|Metrics, optional): Records the metrics of the calls in
+                                              `self.metrics`, a Metrics instance can be given
+                                              to share it. Defaults to True.
+            hedge_policy (HedgePolicy, optional): Sends a second request when a call is
+                                                  slow. Defaults to None (no hedging).
+            store (ObjectStore, optional): Serves confirmed txs and inscriptions from disk
+                                           and keeps the ones received. Defaults to None.
         """
         self.log_exc_info = False
         self.logger = self._set_logger(log_config, log_level)
         self.uds = UDS(self)
-        self.base_url = endpoint
+        if isinstance(endpoint, str):
+            self.endpoints = None
+            self.base_url = endpoint
+        else:
+            if not isinstance(endpoint, EndpointPool):
+                endpoint = EndpointPool(endpoint)
+            self.endpoints = endpoint
+            self.base_url = self.endpoints.urls[0]
         self.bearer = api_key
-        self.retry = 0
-
-    def __enter__(self):
+        self.rate_limiter = rate_limiter
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.hedge_policy = hedge_policy
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self.cache = cache
+        self.store = store
+        self.singleflight = SingleFlight() if coalesce else None
+        self.metrics = Metrics() if metrics is True else (metrics or None)
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_maxsize = pool_maxsize
+        self._pool_options = (pool_connections, pool_maxsize, pool_block)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._headers = {}
+
+    @property
+    def session(self):
         """
-        Enter the runtime context related to this object.
-
-        The `with` statement will bind this method's return value to the target(s)
-        specified in the `as` clause of the statement, if any.
-
-        Returns:
-            Client: The instance of the Client itself.
+        The HTTP session, created on the first call so that constructing a client does
+        not load `requests`.
         """
-        return self
-
-    def __exit__(self, exc_type, exc_value, exc_traceback):
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._set_session(*self._pool_options)
+                session = self._session
+        return session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def close(self):
         """
-        Exit the runtime context and perform any necessary cleanup.
-
-        This method is called when exiting the `with` block. It handles logging
-        of exceptions, if any, and cleans up the logger handlers.
-
-        Parameters:
-            exc_type (type): type of the exception that caused the context to be exited, if any.
-            exc_value (Exception): exception instance that caused the context to be exited, if any.
-            exc_traceback (traceback): traceback object associated with the exception, if any.
+        Close every pooled connection held by the client.
 
-        Returns:
-            bool: False to indicate any exception passed to it should be re-raised.
-                  If omitted or None, exceptions are re-raised.
+        The client can still be used afterwards, new connections will be opened on demand.
         """
-        if exc_type is not None:
-            logger_message = f'{exc_type} {exc_value} was intercepted !'
-            self.logger.error(logger_message, exc_info=self.log_exc_info)
-        self.logger.info('[stopping unisat client]')
-        handlers = self.logger.handlers[:]
-        for handler in handlers:
-            handler.close()
-            self.logger.removeHandler(handler)
-        return False
+        with self._hedge_lock:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+        if self._session is not None:
+            self._session.close()
 
     def log(self, message, level=logging.INFO):
         """
@@ -118,37 +206,137 @@ class Client:
             level = logging.INFO
         self.logger.log(level=level, msg=str(message))
 
-    def call(self, method='GET', route='/', params=None):
+    def _coalescing_key(self, method, route, params):
         """
-        Make an API call to the specified route using the given method and parameters.
+        Identifies identical calls, only GET calls are coalesced.
+
+        Returns:
+            tuple: The key of the call, None if it must not be coalesced.
+        """
+        if self.singleflight is None or method != 'GET':
+            return None
+        return (method, route, tuple(sorted((params or {}).items())))
+
+    def _store_lookup(self, method, route, params):
+        """
+        Looks for the object returned by the call in the store, if one is configured.
 
-        This method handles API requests, retries in case of rate limit errors,
-        and raises a ClientError for unsuccessful responses.
+        Returns:
+            Response: The stored response content, None if the object is not stored.
+        """
+        if self.store is None:
+            return None
+        content = self.store.lookup(method, route, params)
+        if content is not None:
+            self.logger.debug('[STORE HIT] %s %s', method, route)
+            if self.metrics is not None:
+                self.metrics.observe_call(method, route, 0, 0.0, cached=True)
+        return content
+
+    def _cache_lookup(self, method, route, params):
+        """
+        Looks for a cached response of the call, if a cache is configured.
+
+        Returns:
+            dict: The cached response content, None on a cache miss.
+        """
+        if self.cache is None:
+            return None
+        content = self.cache.lookup(method, route, params)
+        if content is not None:
+            self.logger.debug('[CACHE HIT] %s %s', method, route)
+            if self.metrics is not None:
+                self.metrics.observe_call(method, route, 0, 0.0, cached=True)
+        elif self.metrics is not None and self.cache.is_cacheable(method, route):
+            self.metrics.observe_cache_miss(route)
+        return content
+
+    def _finish_call(self, method, route, params, content, error, attempts, waited):
+        """
+        Completes an API call once its retries are over: records its metrics,
+        caches its response and checks it.
 
         Parameters:
-            method (str, optional): The HTTP method to use for the request. Defaults to 'GET'.
-            route (str, optional): The API route to be accessed. Defaults to '/'.
-            params (dict, optional): The parameters to be sent with the request. Defaults to None.
+            method (str): The HTTP method of the call.
+            route (str): The API route of the call.
+            params (dict): The parameters of the call.
+            content (Response): The last response received, None if the request failed.
+            error (ClientError): The error raised by the last request, if any.
+            attempts (int): Number of requests sent.
+            waited (float): Seconds spent waiting between attempts.
 
         Returns:
-            dict: The JSON response content from the API.
+            Response: The JSON response content from the API.
+
+        Raises:
+            ClientError: If the API response is not successful.
+        """
+        if error is None:
+            content['retry_stats'] = {'attempts': attempts, 'wait': waited}
+            self._cache_store(method, route, params, content)
+            if self.store is not None:
+                self.store.save(method, route, params, content)
+            try:
+                self._check_response(content)
+            except ClientError as exc:
+                error = exc
+        if self.metrics is not None:
+            self.metrics.observe_call(method, route, attempts, waited, error)
+        if error is not None:
+            raise error
+        return content
+
+    def _observe_rate_limiter_wait(self, wait):
+        """
+        Records the seconds a call waited for the rate limiter.
+        """
+        if self.metrics is not None and wait:
+            self.metrics.observe_rate_limiter_wait(wait)
+
+    def _cache_store(self, method, route, params, content):
+        """
+        Stores the response of the call, if a cache is configured.
+        """
+        if self.cache is not None:
+            self.cache.store(method, route, params, content)
+
+    def _retry_delay(self, method, attempt, started, content, error):
+        """
+        Asks the retry policy whether a failed attempt should be sent again.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            attempt (int): Number of attempts already made.
+            started (float): `time.monotonic()` value when the call started.
+            content (dict): The response content, None if the request raised an error.
+            error (ClientError): The error raised while sending the request, if any.
+
+        Returns:
+            float: Number of seconds to wait before the next attempt, None to give up.
+        """
+        if content is not None and content['http_status_code'] == 200:
+            return None
+        delay = self.retry_policy.next_delay(method, attempt, time.monotonic() - started,
+                                             content, error)
+        if delay is not None:
+            reason = error if error is not None else content.get('msg')
+            self.logger.info(f'attempt {attempt} failed ({reason}), retry in {delay:.3f} seconds')
+        return delay
+
+    def _check_response(self, content):
+        """
+        Raises a ClientError for unsuccessful API responses.
+
+        Parameters:
+            content (dict): The response content returned by `_send_request`.
+
+        Returns:
+            dict: The response content, unchanged.
 
         Raises:
             ClientError: If the API response is not successful.
         """
         valid_status_code_list = [200]
-        (method, url, headers, data) = self._configure_request(method, route, params)
-        content = self._send_request(method, url, headers, data)
-        if content['http_status_code'] == 403 and content['msg'] == 'exceeds rate limit':
-            if self.retry == 0:
-                self.logger.info('exceeds rate limite error catched, retry in 1 second')
-                self.retry += 1
-                time.sleep(1)
-                content = self._send_request(method, url, headers, data)
-            else:
-                self.logger.info('exceeds rate limite error catched again !')
-                self.retry = 0
-                raise ClientError(data=content, logger=self.logger, log_exc_info=self.log_exc_info)
         if content['http_status_code'] not in valid_status_code_list:
             raise ClientError(data=content, logger=self.logger, log_exc_info=self.log_exc_info)
         return content
@@ -168,61 +356,332 @@ class Client:
         Returns:
             tuple: A tuple containing the method, URL, headers, and data for the request.
         """
-        logger_message = f'[CALL] _configure_requests({str(method)}, {str(route)}, {str(params)})'
-        self.logger.debug(logger_message)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger_message = f'[CALL] _configure_requests({method}, {route}, {_truncate(params)})'
+            self.logger.debug(logger_message)
         url = self.base_url + route
-        headers = {'accept': 'application/json', 'X-Client': "unisat-wrapper v0.0.42 alpha"}
-        if self.bearer:
-            headers['Authorization'] = f'Bearer {self.bearer}'
-        if method == "POST":
-            headers['Content-Type'] = 'application/json;charset=utf-8'
-        params = {k: str(v) for k, v in params.items()} if params else None
-        data = json.dumps(params) if params is not None else None
-        msg = '[RETURN _configure_requests]'
-        msg += f'(method={method}, url={url}, headers={str(headers)}, data={str(data)})'
-        self.logger.debug(msg)
+        headers = self._get_headers(method)
+        data = None
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+            if method == 'GET':
+                url += '?' + urlencode(params)
+            else:
+                data = json.dumps(params)
+        if debug:
+            msg = '[RETURN _configure_requests]'
+            msg += f'(method={method}, url={url}, headers={_redact(headers)}, '
+            msg += f'data={_truncate(data)})'
+            self.logger.debug(msg)
         return (method, url, headers, data)
 
-    def _send_request(self, method, url, headers, data):
+    def _get_headers(self, method):
+        """
+        Returns the headers of the requests of a method, built once and shared by every
+        call until the bearer or the keep-alive setting changes.
+
+        Returns:
+            MappingProxyType: The read-only headers.
+        """
+        key = (method, self.bearer, self.keep_alive)
+        headers = self._headers.get(key)
+        if headers is None:
+            headers = {'accept': 'application/json', 'X-Client': "unisat-wrapper v0.0.42 alpha"}
+            if self.bearer:
+                headers['Authorization'] = f'Bearer {self.bearer}'
+            if method == "POST":
+                headers['Content-Type'] = 'application/json;charset=utf-8'
+            if not self.keep_alive:
+                headers['Connection'] = 'close'
+            headers = self._headers[key] = MappingProxyType(headers)
+        return headers
+
+    def _send_request(self, method, url, headers, data, timeout=None):
         """
         Sends an API request and returns the response.
 
         Performs the actual API request using the specified method, URL, headers, and data.
-        It handles JSON response parsing and returns a dict with response content and HTTP code.
+        The JSON body is decoded straight from the response bytes with the fastest
+        installed backend, and wrapped with the HTTP code without being copied.
 
         Parameters:
             method (str): The HTTP method for the request.
             url (str): The full URL for the request.
             headers (dict): Headers to be sent with the request.
             data (str): Stringified JSON data to be sent with the request (if applicable).
+            timeout (tuple, optional): The (connect, read) timeouts. Defaults to the ones
+                                       of the client.
 
         Returns:
-            dict: A dictionary containing the response content and the HTTP status code.
+            Response: The response content and the HTTP status code.
         """
-        msg = f'[CALL] _send_requests({str(method)}, {str(url)}, {str(headers)}, {str(data)})'
-        self.logger.debug(msg)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            msg = f'[CALL] _send_requests({method}, {url}, {_redact(headers)}, {_truncate(data)})'
+            self.logger.debug(msg)
+        session = self.session
+        import requests  # loaded with the session
+        started = time.perf_counter()
         try:
-            req = requests.request(method, url, headers=headers, data=data)
-            output = req.json()
-        except requests.JSONDecodeError:
-            output = {'code': -500, 'msg': 'Client not receive json !'}
-        except requests.RequestException:
+            req = session.request(method, url, headers=headers, data=data,
+                                  timeout=self.timeout if timeout is None else timeout)
+        except requests.RequestException as exc:
+            self._observe_request(method, url, None, started, None, None, 0)
             msg = "An exception was raised by 'requests' module, "
             msg += "investigation is needed to identify the root cause, "
             msg += "e.g., incorrect URL, no internet access, unavailability of remote service, ..."
             self.logger.error(msg, exc_info=self.log_exc_info)
-            raise ClientError(data=None)
-        status = {'http_status_code': req.status_code}
-        content = {**status, **output}
-        self.logger.debug(f'[RETURN _send_requests] (content={str(content)}')
+            raise ClientError(data=None) from exc
+        decode_started = time.perf_counter()
+        try:
+            output = codec.loads(req.content)
+        except ValueError:
+            output = None
+        if not isinstance(output, dict):
+            output = {'code': -500, 'msg': 'Client not receive json !'}
+        extra = {}
+        if 'Retry-After' in req.headers:
+            extra['retry_after'] = req.headers['Retry-After']
+        content = Response(req.status_code, output, extra)
+        self._observe_request(method, url, req.status_code, started,
+                              req.elapsed.total_seconds(), time.perf_counter() - decode_started,
+                              len(req.content), is_rate_limited(content))
+        if debug:
+            self._log_response(content, len(req.content))
         return content
 
+    def _dispatch(self, method, url, headers, data, used=None, avoid=(), timeout=None):
+        """
+        Sends an API request to the preferred endpoint whose circuit is not open.
+
+        With several endpoints, a transport error or a 5xx response is sent again at once
+        to the next endpoint for the methods retried by the retry policy, so a host down
+        does not cost a timeout per call once its circuit is open. The resend takes a
+        token from the rate limiter, if any, like any other request.
+
+        Parameters:
+            method (str): The HTTP method for the request.
+            url (str): The full URL for the request, on the first endpoint.
+            headers (dict): Headers to be sent with the request.
+            data (str): Stringified JSON data to be sent with the request (if applicable).
+            used (list, optional): Receives the endpoints the request is sent to.
+            avoid (iterable, optional): Endpoints used only if no other one is available.
+            timeout (tuple, optional): The (connect, read) timeouts of each request.
+
+        Returns:
+            Response: The response content and the HTTP status code.
+
+        Raises:
+            ClientError: If the request failed on every endpoint tried.
+        """
+        if self.endpoints is None:
+            return self._send_request(method, url, headers, data, timeout)
+        path = url[len(self.base_url):]
+        failover = method in self.retry_policy.retry_methods
+        tried, content, error = [], None, None
+        while True:
+            endpoint = self.endpoints.select(tried + list(avoid))
+            if endpoint is None and avoid:
+                endpoint = self.endpoints.select(tried)
+            if endpoint is None:
+                break
+            if tried and self.rate_limiter is not None:
+                # the resend is one more request against the quota
+                self._observe_rate_limiter_wait(self.rate_limiter.acquire())
+            tried.append(endpoint)
+            if used is not None:
+                used.append(endpoint)
+            started = time.perf_counter()
+            try:
+                content, error = self._send_request(method, endpoint.url + path, headers,
+                                                    data, timeout), None
+            except ClientError as exc:
+                content, error = None, exc
+            success = error is None and content.http_status_code not in FAILURE_STATUSES
+            state = self.endpoints.record(endpoint, success, time.perf_counter() - started)
+            if state is not None:
+                self.logger.warning(f'circuit of {endpoint.url} is {state}')
+            if success or not failover:
+                break
+        if error is not None:
+            raise error
+        if content is None:
+            data = {'msg': 'every endpoint circuit is open'}
+            raise ClientError(data=data, logger=self.logger, log_exc_info=self.log_exc_info)
+        return content
+
+    def _attempt_timeout(self, started):
+        """
+        Returns:
+            tuple: The (connect, read) timeouts of the next attempt of a call, cut to the
+                   time left before the deadline of the retry policy. None once the
+                   deadline has passed.
+        """
+        left = self._time_left(started)
+        if left is None:
+            return self.timeout
+        if left <= 0:
+            return None
+        return (min(self.timeout[0], left), min(self.timeout[1], left))
+
+    def _time_left(self, started):
+        """
+        Returns:
+            float: Seconds left before the deadline of the retry policy for a call
+                   started at `started`, None without deadline.
+        """
+        deadline = self.retry_policy.deadline
+        if deadline is None:
+            return None
+        return deadline - (time.monotonic() - started)
+
+    def _deadline_error(self):
+        """
+        Returns:
+            ClientError: The error of a call whose deadline passed before its first request.
+        """
+        data = {'msg': 'call deadline exceeded'}
+        return ClientError(data=data, logger=self.logger, log_exc_info=self.log_exc_info)
+
+    def _hedge_options(self, used):
+        """
+        Returns:
+            dict: The `_dispatch` options of a hedge, sent to another endpoint than the
+                  first request when the hedge policy asks so.
+        """
+        if self.endpoints is None or not self.hedge_policy.other_host:
+            return {}
+        return {'avoid': list(used)}
+
+    def _get_hedge_executor(self):
+        """
+        Returns:
+            ThreadPoolExecutor: The threads sending the hedged requests, created on first use.
+        """
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize * 4,
+                                                          thread_name_prefix='unisat-hedge')
+            return self._hedge_executor
+
+    def _acquire_hedge(self):
+        """
+        Takes a hedge from the hedge policy budget, then a token from the rate limiter,
+        if any, so that no token is spent on a hedge refused by the budget. A hedge is
+        skipped rather than delayed when no token is available at once, its budget being
+        given back.
+
+        Returns:
+            bool: True if the hedge can be sent.
+        """
+        if not self.hedge_policy.acquire():
+            return False
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            self.hedge_policy.release()
+            return False
+        return True
+
+    def _is_hedgeable(self, method):
+        """
+        Returns:
+            bool: True if the requests of the method are hedged.
+        """
+        return self.hedge_policy is not None and method in self.hedge_policy.methods
+
+    def _observe_request(self, method, url, status, started, ttfb, decode, size,
+                         rate_limited=False):
+        """
+        Records the metrics of an HTTP request, if metrics are enabled.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            url (str): The full URL of the request.
+            status (int): The HTTP status code, None if no response was received.
+            started (float): `time.perf_counter()` value when the request was sent.
+            ttfb (float): Seconds until the response headers were received.
+            decode (float): Seconds spent decoding the JSON body.
+            size (int): Size of the response body in bytes.
+            rate_limited (bool, optional): True for a 403 'exceeds rate limit' response.
+        """
+        if self.metrics is not None:
+            latency = time.perf_counter() - started
+            route = urlsplit(url).path
+            self.metrics.observe_request(method, route, status, latency, ttfb, decode, size,
+                                         rate_limited)
+
+    def _log_response(self, content, size):
+        """
+        Logs a summary of a response at DEBUG level.
+
+        The payload is summarized and truncated to `DEBUG_BODY_LIMIT` characters, so a large
+        page does not end up fully serialized in the journal.
+
+        Parameters:
+            content (Response): The response content.
+            size (int): Size of the response body in bytes.
+        """
+        data = content.data
+        if isinstance(data, (list, dict)):
+            shape = f'{type(data).__name__} of {len(data)} items'
+        else:
+            shape = type(data).__name__
+        msg = f'[RETURN _send_requests] (http_status_code={content.http_status_code}, '
+        msg += f'code={content.code}, msg={content.msg}, bytes={size}, data={shape}: '
+        msg += f'{_truncate(data)})'
+        self.logger.debug(msg)
+
+    def _shutdown(self, exc_type, exc_value):
+        """
+        Logs the exception that ended the client context, if any, closes the connections
+        and cleans up the logger handlers.
+
+        Parameters:
+            exc_type (type): type of the exception that caused the context to be exited, if any.
+            exc_value (Exception): exception instance that caused the context to be exited, if any.
+        """
+        if exc_type is not None:
+            logger_message = f'{exc_type} {exc_value} was intercepted !'
+            self.logger.error(logger_message, exc_info=self.log_exc_info)
+        self.logger.info('[stopping unisat client]')
+        for handler in self._log_handlers:
+            handler.close()
+            self.logger.removeHandler(handler)
+        self._log_handlers = []
+        self.close()
+
+    def _set_session(self, pool_connections, pool_maxsize, pool_block):
+        """
+        Creates the HTTP session used for every API call.
+
+        The session keeps TCP/TLS connections alive between calls, so consecutive requests
+        to the same host skip the connection handshake.
+
+        Parameters:
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept open per host.
+            pool_block (bool): Wait for a free connection when the host pool is exhausted.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def _set_logger(self, output, level):
         """
         Configures and sets up the logger for the client.
 
         Initializes and configures a logger based on the specified output type and logging level.
         This logger is then used for logging messages throughout the client.
+        With no output, the module logger is used and the application logging configuration
+        applies.
 
         Parameters:
             output (str): The output type for the logger. Can be 'stderr', a file name, or None.
@@ -232,14 +691,234 @@ class Client:
             logging.Logger: The configured logger instance.
         """
         if output is None:
-            logger = logging.getLogger(__name__)
-            logger.addHandler(logging.NullHandler())
-            return logger
+            self._log_handlers = []
+            return logging.getLogger(__name__)
         format_str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         if output == 'stderr':
-            logging.basicConfig(level=level, format=format_str, stream=sys.stderr)
+            handler = logging.StreamHandler(sys.stderr)
         else:
-            logging.basicConfig(level=level, format=format_str, filename=output, filemode='a')
-        logger = logging.getLogger(__name__)
+            handler = logging.FileHandler(output, mode='a')
+        handler.setFormatter(logging.Formatter(format_str))
+        # A logger owned by this client: its handlers are never shared with other clients
+        # and are not installed on the root logger.
+        logger = logging.Logger(__name__, level)
+        logger.addHandler(handler)
+        self._log_handlers = [handler]
         logger.info('starting unisat client')
         return logger
+
+class Client(BaseClient):
+    """
+    A client class for interacting with the UniSat Developer Service API.
+
+    This class provides methods for sending requests to the API, handling errors,
+    logging messages, and managing API calls.
+    A single instance can be shared by several threads.
+    """
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object.
+
+        The `with` statement will bind this method's return value to the target(s)
+        specified in the `as` clause of the statement, if any.
+
+        Returns:
+            Client: The instance of the Client itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context and perform any necessary cleanup.
+
+        This method is called when exiting the `with` block. It handles logging
+        of exceptions, if any, and cleans up the logger handlers.
+
+        Parameters:
+            exc_type (type): type of the exception that caused the context to be exited, if any.
+            exc_value (Exception): exception instance that caused the context to be exited, if any.
+            exc_traceback (traceback): traceback object associated with the exception, if any.
+
+        Returns:
+            bool: False to indicate any exception passed to it should be re-raised.
+                  If omitted or None, exceptions are re-raised.
+        """
+        self._shutdown(exc_type, exc_value)
+        return False
+
+    def call(self, method='GET', route='/', params=None, use_cache=True):
+        """
+        Make an API call to the specified route using the given method and parameters.
+
+        This method handles API requests, retries failed attempts according to the
+        retry policy, and raises a ClientError for unsuccessful responses.
+
+        The `retry_stats` key of the response holds the number of attempts made
+        and the number of seconds spent waiting between them.
+
+        Parameters:
+            method (str, optional): The HTTP method to use for the request. Defaults to 'GET'.
+            route (str, optional): The API route to be accessed. Defaults to '/'.
+            params (dict, optional): The parameters to be sent with the request. Defaults to None.
+            use_cache (bool, optional): Look for the response in the response cache.
+                                        False fetches it from the API, the cache being
+                                        updated with it. Defaults to True.
+
+        Returns:
+            Response: The JSON response content from the API, usable as a dict.
+
+        Raises:
+            ClientError: If the API response is not successful.
+        """
+        cached = self._store_lookup(method, route, params)
+        if cached is None and use_cache:
+            cached = self._cache_lookup(method, route, params)
+        if cached is not None:
+            return cached
+        key = self._coalescing_key(method, route, params)
+        if key is None:
+            return self._call_api(method, route, params)
+        return self.singleflight.do(key, lambda: self._call_api(method, route, params))
+
+    def map(self, function, *iterables, max_workers=None, return_exceptions=True):
+        """
+        Runs `function` over the items of `iterables` on a bounded pool of threads.
+
+        Example: `client.map(client.uds.general.get_tx_info, txids)`
+
+        Parameters:
+            function (callable): A method of `client.uds.general` or `client.uds.brc20`,
+                                 or any callable using this client.
+            *iterables (iterable): The arguments of each call, as in the builtin `map()`.
+            max_workers (int, optional): Maximum number of calls in flight.
+                                         Defaults to the connection pool size.
+            return_exceptions (bool, optional): Return the exception raised by a call in
+                                                place of its result instead of aborting the
+                                                whole batch. Defaults to True.
+
+        Returns:
+            list: The results of the calls, in the order of the arguments.
+        """
+        def run(*args):
+            try:
+                return function(*args)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        max_workers = self.pool_maxsize if max_workers is None else max_workers
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='unisat') as executor:
+            return list(executor.map(run, *iterables))
+
+    def _call_api(self, method, route, params):
+        """
+        Sends an API call to the network, retrying failed attempts.
+
+        Parameters:
+            method (str): The HTTP method to use for the request.
+            route (str): The API route to be accessed.
+            params (dict): The parameters to be sent with the request.
+
+        Returns:
+            Response: The JSON response content from the API, usable as a dict.
+
+        Raises:
+            ClientError: If the API response is not successful.
+        """
+        request = self._configure_request(method, route, params)
+        started = time.monotonic()
+        attempt, waited = 0, 0.0
+        while True:
+            attempt += 1
+            timeout = None
+            if self._wait_rate_limiter(started):
+                timeout = self._attempt_timeout(started)
+            if timeout is None:
+                if attempt == 1:
+                    (content, error) = (None, self._deadline_error())
+                break
+            try:
+                content, error = self._send_hedged(request, timeout), None
+            except ClientError as exc:
+                content, error = None, exc
+            delay = self._retry_delay(request[0], attempt, started, content, error)
+            if delay is None:
+                break
+            time.sleep(delay)
+            waited += delay
+        return self._finish_call(method, route, params, content, error, attempt, waited)
+
+    def _send_hedged(self, request, timeout=None):
+        """
+        Sends an API request, and a second one if the hedge policy finds the first slow.
+
+        The first successful answer is returned, the other request is abandoned: it is
+        cancelled if not sent yet, otherwise its response is discarded.
+
+        Parameters:
+            request (tuple): The method, URL, headers and data of the request.
+            timeout (tuple, optional): The (connect, read) timeouts of each request.
+
+        Returns:
+            Response: The response content and the HTTP status code.
+
+        Raises:
+            ClientError: If every request sent failed.
+        """
+        if not self._is_hedgeable(request[0]):
+            return self._dispatch(*request, timeout=timeout)
+        executor = self._get_hedge_executor()
+        delay = self.hedge_policy.start_call()
+        started, used = time.perf_counter(), []
+        first = executor.submit(self._dispatch, *request, used=used, timeout=timeout)
+        first.add_done_callback(
+            lambda _: self.hedge_policy.observe(time.perf_counter() - started))
+        pending = {first}
+        (done, _) = wait(pending, timeout=delay)
+        if not done and self._acquire_hedge():
+            self.logger.debug('[HEDGE] %s %s after %.3f seconds', request[0], request[1], delay)
+            pending.add(executor.submit(self._dispatch, *request, timeout=timeout,
+                                        **self._hedge_options(used)))
+        content, error = None, None
+        while pending:
+            (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    answer = future.result()
+                except ClientError as exc:
+                    error = exc
+                    continue
+                if answer.http_status_code == 200:
+                    for other in pending:
+                        other.cancel()
+                    if future is not first:
+                        self.hedge_policy.record_win()
+                    return answer
+                content = answer
+        if content is None:
+            raise error
+        return content
+
+    def _wait_rate_limiter(self, started):
+        """
+        Blocks until the rate limiter, if any, allows the next attempt of a call.
+
+        Parameters:
+            started (float): `time.monotonic()` value when the call started.
+
+        Returns:
+            bool: False if the deadline of the retry policy would pass first, no token
+                  being taken then.
+        """
+        if self.rate_limiter is None:
+            return True
+        left = self._time_left(started)
+        if left is not None and left <= 0:
+            return False
+        wait = self.rate_limiter.acquire(left)
+        if wait is None:
+            return False
+        self._observe_rate_limiter_wait(wait)
+        return True
@@ -0,0 +1,53 @@
+# JSON backend used to decode API responses.
+# The fastest installed library is picked on first use of `loads` or `BACKEND`: orjson,
+# then msgspec, then the standard library json module. Set the `UNISAT_JSON` environment
+# variable to `orjson`, `msgspec` or `json` to force one of them.
+import json
+import os
+
+def _load_orjson():
+    import orjson
+    return orjson.loads
+
+def _load_msgspec():
+    import msgspec
+    decoder = msgspec.json.Decoder()
+    def loads(content):
+        try:
+            return decoder.decode(content)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+    return loads
+
+def _load_json():
+    return json.loads
+
+BACKENDS = {'orjson': _load_orjson, 'msgspec': _load_msgspec, 'json': _load_json}
+
+def get_loads(name=None):
+    """
+    Returns the `loads` function of a JSON backend.
+
+    Parameters:
+        name (str, optional): 'orjson', 'msgspec' or 'json'. Defaults to the fastest
+                              installed backend.
+
+    Returns:
+        tuple: The backend name and its `loads(bytes)` function, raising ValueError
+               on invalid documents.
+    """
+    names = [name] if name else list(BACKENDS)
+    for candidate in names:
+        try:
+            return (candidate, BACKENDS[candidate]())
+        except ImportError:
+            continue
+    raise ImportError(f'JSON backend {name} is not installed')
+
+def __getattr__(name):
+    # the backend is imported when the first response is decoded, not with the client
+    if name not in ('BACKEND', 'loads'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    global BACKEND, loads
+    (BACKEND, loads) = get_loads(os.environ.get('UNISAT_JSON'))
+    return globals()[name]
@@ -0,0 +1,293 @@
+import abc
+import csv
+import decimal
+import json
+
+# Known fields of the API records and their column types
+DECIMAL_FIELDS = (
+    'overallBalance', 'transferableBalance', 'availableBalance', 'availableBalanceSafe',
+    'availableBalanceUnSafe', 'transferBalance', 'amount', 'max', 'limit', 'minted',
+    'totalMinted', 'confirmedMinted', 'confirmedMinted1h', 'confirmedMinted24h',
+)
+INTEGER_FIELDS = (
+    'height', 'blocks', 'headers', 'timestamp', 'blocktime', 'medianTime', 'confirmations',
+    'satoshi', 'pendingSatoshi', 'btcSatoshi', 'inscriptionSatoshi', 'inSatoshi',
+    'outSatoshi', 'vout', 'idx', 'txidx', 'inscriptionNumber', 'holdersCount',
+    'historyCount', 'deployHeight', 'completeHeight', 'size', 'vsize', 'weight', 'nIn', 'nOut',
+)
+
+# BRC20 amounts have up to 18 decimals, and maximum supplies can exceed 38 digits
+DECIMAL_PRECISION = 76
+DECIMAL_SCALE = 18
+
+class Sink(abc.ABC):
+    """
+    Base class of the streaming sinks: records are buffered and written by batches of
+    `buffer_size`, so exporting a paginated result uses a bounded amount of memory.
+    Subclasses implement `_write_batch()`, and `_close()` to release their output.
+    """
+
+    def __init__(self, buffer_size=1000):
+        """
+        Parameters:
+            buffer_size (int, optional): Number of records kept in memory before being
+                                         written. Defaults to 1000.
+        """
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+        return False
+
+    def write(self, record):
+        """
+        Adds a record, the buffer is flushed when full.
+
+        Parameters:
+            record (dict): A record, e.g. one item yielded by an `iter_` method.
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, records):
+        """
+        Adds every record of an iterable, consumed lazily.
+
+        Returns:
+            int: Number of records added.
+        """
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def flush(self):
+        """
+        Writes the buffered records.
+        """
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.count += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """
+        Writes the remaining records and closes the output.
+        """
+        self.flush()
+        self._close()
+
+    @abc.abstractmethod
+    def _write_batch(self, records):
+        """
+        Writes a batch of buffered records to the output.
+        """
+
+    def _close(self):
+        pass
+
+class NDJSONSink(Sink):
+    """
+    Writes records as newline-delimited JSON, one record per line.
+    """
+
+    def __init__(self, path, buffer_size=1000):
+        """
+        Parameters:
+            path (str): Path of the output file.
+            buffer_size (int, optional): Number of records written per batch.
+        """
+        super().__init__(buffer_size)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write_batch(self, records):
+        self._file.write(''.join(json.dumps(record, separators=(',', ':')) + '\n'
+                                 for record in records))
+
+    def _close(self):
+        self._file.close()
+
+class CSVSink(Sink):
+    """
+    Writes records as CSV rows, nested values being encoded as JSON.
+
+    Columns are the keys of the first batch unless given.
+    """
+
+    def __init__(self, path, columns=None, buffer_size=1000):
+        """
+        Parameters:
+            path (str): Path of the output file.
+            columns (list, optional): Columns written, in order. Defaults to the keys of
+                                      the first records.
+            buffer_size (int, optional): Number of records written per batch.
+        """
+        super().__init__(buffer_size)
+        self.columns = columns
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = None
+
+    def _write_batch(self, records):
+        if self._writer is None:
+            self.columns = self.columns or _get_columns(records)
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+        self._writer.writerows([[_to_text(record.get(column)) for column in self.columns]
+                                for record in records])
+
+    def _close(self):
+        self._file.close()
+
+class ArrowSink(Sink):
+    """
+    Writes records as typed Arrow columns, to a Parquet file or an Arrow IPC file.
+    Requires pyarrow.
+
+    Balances are stored as decimal256(76, 18), heights, timestamps and amounts of
+    satoshis as int64. Other columns are typed from the first batch, nested values
+    being encoded as JSON strings. Keys missing from the first batch are ignored.
+    """
+
+    def __init__(self, path, format='parquet', columns=None, buffer_size=10000,
+                 compression='zstd'):
+        """
+        Parameters:
+            path (str): Path of the output file.
+            format (str, optional): 'parquet' or 'arrow' (IPC file). Defaults to 'parquet'.
+            columns (list, optional): Columns written. Defaults to the keys of the first
+                                      records.
+            buffer_size (int, optional): Number of records per row group / record batch.
+            compression (str, optional): Parquet compression codec. Defaults to 'zstd'.
+        """
+        try:
+            import pyarrow
+        except ImportError as exc:
+            raise ImportError('pyarrow is required to write Arrow or Parquet files') from exc
+        super().__init__(buffer_size)
+        self.pa = pyarrow
+        self.path = path
+        self.format = format
+        self.columns = columns
+        self.compression = compression
+        self.schema = None
+        self._writer = None
+
+    def _write_batch(self, records):
+        if self.schema is None:
+            self.columns = self.columns or _get_columns(records)
+            self.schema = self.pa.schema([(column, self._get_type(column, records))
+                                          for column in self.columns])
+            self._writer = self._open_writer()
+        arrays = [self.pa.array([self._convert(field, record.get(field.name))
+                                 for record in records], type=field.type)
+                  for field in self.schema]
+        batch = self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.format == 'parquet':
+            self._writer.write_table(self.pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def _open_writer(self):
+        if self.format == 'parquet':
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(self.path, self.schema,
+                                                 compression=self.compression)
+        if self.format == 'arrow':
+            return self.pa.ipc.new_file(self.path, self.schema)
+        raise ValueError(f'unknown format {self.format}, use parquet or arrow')
+
+    def _get_type(self, column, records):
+        if column in DECIMAL_FIELDS:
+            return self.pa.decimal256(DECIMAL_PRECISION, DECIMAL_SCALE)
+        if column in INTEGER_FIELDS:
+            return self.pa.int64()
+        value = next((r.get(column) for r in records if r.get(column) is not None), None)
+        if isinstance(value, bool):
+            return self.pa.bool_()
+        if isinstance(value, int):
+            return self.pa.int64()
+        if isinstance(value, float):
+            return self.pa.float64()
+        return self.pa.string()
+
+    def _convert(self, field, value):
+        if value is None:
+            return None
+        if self.pa.types.is_decimal(field.type):
+            return _to_decimal(value)
+        if self.pa.types.is_string(field.type):
+            value = _to_text(value)
+            return value if isinstance(value, str) else str(value)
+        if self.pa.types.is_integer(field.type):
+            return int(value)
+        return value
+
+class ParquetSink(ArrowSink):
+    """
+    An ArrowSink writing a Parquet file. Requires pyarrow.
+    """
+
+    def __init__(self, path, columns=None, buffer_size=10000, compression='zstd'):
+        """
+        Parameters:
+            path (str): Path of the output file.
+            columns (list, optional): Columns written. Defaults to the keys of the first
+                                      records.
+            buffer_size (int, optional): Number of records per row group.
+            compression (str, optional): Compression codec. Defaults to 'zstd'.
+        """
+        super().__init__(path, 'parquet', columns, buffer_size, compression)
+
+def export(records, sink):
+    """
+    Writes every record of an iterable to a sink, then closes it.
+
+    Example: `export(brc20.iter_brc20_holders('ordi'), ParquetSink('ordi.parquet'))`
+
+    Parameters:
+        records (iterable): Records to write, consumed lazily.
+        sink (Sink): The output.
+
+    Returns:
+        int: Number of records written.
+    """
+    with sink:
+        return sink.write_many(records)
+
+def _get_columns(records):
+    """
+    Returns the keys of the records, in order of first appearance.
+    """
+    columns = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    return list(columns)
+
+def _to_text(value):
+    """
+    Returns a scalar as is and encodes nested values as JSON.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+_decimal_context = decimal.Context(prec=DECIMAL_PRECISION)
+_decimal_quantum = decimal.Decimal(1).scaleb(-DECIMAL_SCALE)
+
+def _to_decimal(value):
+    """
+    Returns a balance (usually a decimal string) as a Decimal with DECIMAL_SCALE digits.
+    """
+    return _decimal_context.create_decimal(str(value)).quantize(_decimal_quantum,
+                                                                 context=_decimal_context)
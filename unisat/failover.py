@@ -0,0 +1,270 @@
+import threading
+import time
+from collections import deque
+
+# HTTP status codes counted as a failure of the endpoint, along with transport errors
+FAILURE_STATUSES = (500, 502, 503, 504)
+
+class CircuitBreaker:
+    """
+    Stops sending requests to an endpoint that keeps failing.
+
+    The circuit opens after `failure_threshold` consecutive failures, or when the error
+    rate over the last `window` requests reaches `error_rate`. While open, requests are
+    refused without waiting for a timeout. After `reset_timeout` seconds the circuit is
+    half-open: `half_open_calls` probe requests are let through, a success closes the
+    circuit and a failure opens it again.
+
+    A single instance is thread-safe.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, error_rate=0.5, window=20, min_calls=10,
+                 reset_timeout=30, half_open_calls=1):
+        """
+        Initialize the CircuitBreaker instance.
+
+        Parameters:
+            failure_threshold (int, optional): Consecutive failures opening the circuit.
+            error_rate (float, optional): Ratio of failures over the last `window` requests
+                                          opening the circuit. Defaults to 0.5.
+            window (int, optional): Number of requests the error rate is computed on.
+            min_calls (int, optional): Requests needed in the window before the error rate
+                                       is considered. Defaults to 10.
+            reset_timeout (float, optional): Seconds the circuit stays open before probing.
+            half_open_calls (int, optional): Probe requests allowed while half-open.
+        """
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self):
+        """'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._get_state()
+
+    def allow(self):
+        """
+        Tells whether a request can be sent, and counts it as a probe when half-open.
+
+        Returns:
+            bool: True if the request can be sent.
+        """
+        with self._lock:
+            state = self._get_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        """
+        Records a request that succeeded.
+
+        Returns:
+            str: The new state if it changed, None otherwise.
+        """
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            if self._get_state() == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                return self.CLOSED
+            return None
+
+    def record_failure(self):
+        """
+        Records a request that failed.
+
+        Returns:
+            str: The new state if it changed, None otherwise.
+        """
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            state = self._get_state()
+            if state == self.OPEN:
+                return None
+            failures = self._outcomes.count(False)
+            if (state == self.HALF_OPEN
+                    or self._consecutive_failures >= self.failure_threshold
+                    or (len(self._outcomes) >= self.min_calls
+                        and failures / len(self._outcomes) >= self.error_rate)):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._times_opened += 1
+                return self.OPEN
+            return None
+
+    def reset(self):
+        """
+        Closes the circuit and forgets the previous requests.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._consecutive_failures = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: The state, the number of times the circuit opened, the requests refused
+                  and the error rate over the window.
+        """
+        with self._lock:
+            outcomes = len(self._outcomes)
+            return {
+                'state': self._get_state(),
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+                'consecutive_failures': self._consecutive_failures,
+                'error_rate': self._outcomes.count(False) / outcomes if outcomes else 0.0,
+            }
+
+    def _get_state(self):
+        """
+        Returns the current state, moving from open to half-open once `reset_timeout`
+        is over. The lock must be held.
+        """
+        if (self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+class Endpoint:
+    """
+    A host of the API, with its circuit breaker and its latency.
+    """
+
+    def __init__(self, url, breaker):
+        self.url = url
+        self.breaker = breaker
+        self.latency = None
+        self.requests = 0
+        self.failures = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: The number of requests and failures, the average latency and the
+                  circuit breaker statistics of the endpoint.
+        """
+        return dict(self.breaker.stats(), url=self.url, requests=self.requests,
+                    failures=self.failures, latency=self.latency)
+
+class EndpointPool:
+    """
+    An ordered list of API hosts serving the same data, e.g. `[MAINNET, WHITELIST]`.
+
+    Each request goes to the first host whose circuit is not open, so requests fail over
+    to the next hosts while the first ones are down. With `prefer_latency`, a host further
+    in the list is preferred when its average latency is lower by more than
+    `latency_margin` per position, and every `probe_interval` requests the host with the
+    fewest requests is used to keep its latency up to date.
+    """
+
+    def __init__(self, endpoints, prefer_latency=True, latency_margin=0.2, probe_interval=100,
+                 smoothing=0.2, **breaker_options):
+        """
+        Initialize the EndpointPool instance.
+
+        Parameters:
+            endpoints (list): The base URLs of the API, by order of preference.
+            prefer_latency (bool, optional): Prefer the fastest hosts. Defaults to True.
+            latency_margin (float, optional): Latency advantage required per position in
+                                              the list to be preferred. Defaults to 0.2.
+            probe_interval (int, optional): Requests between two latency probes of the
+                                            least used host, 0 to disable. Defaults to 100.
+            smoothing (float, optional): Weight of the last request in the average latency.
+            **breaker_options: Options of the CircuitBreaker of each host.
+        """
+        if not endpoints:
+            raise ValueError('at least one endpoint is required')
+        self.endpoints = [Endpoint(url, CircuitBreaker(**breaker_options)) for url in endpoints]
+        self.prefer_latency = prefer_latency
+        self.latency_margin = latency_margin
+        self.probe_interval = probe_interval
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._selections = 0
+
+    @property
+    def urls(self):
+        """The base URLs of the hosts, in order."""
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def select(self, exclude=()):
+        """
+        Picks the host of the next request.
+
+        Parameters:
+            exclude (iterable, optional): Hosts already tried by the current request.
+
+        Returns:
+            Endpoint: The host to use, None if every circuit is open.
+        """
+        candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+        with self._lock:
+            self._selections += 1
+            probe = (self.prefer_latency and self.probe_interval and len(candidates) > 1
+                     and self._selections % self.probe_interval == 0)
+        if probe:
+            candidates.sort(key=lambda endpoint: endpoint.requests)
+        elif self.prefer_latency:
+            order = {endpoint: i for (i, endpoint) in enumerate(self.endpoints)}
+            candidates.sort(key=lambda endpoint: (
+                (endpoint.latency if endpoint.latency is not None else float('inf'))
+                * (1 + self.latency_margin * order[endpoint]), order[endpoint]))
+        for endpoint in candidates:
+            if endpoint.breaker.allow():
+                return endpoint
+        return None
+
+    def record(self, endpoint, success, latency=None):
+        """
+        Records the outcome of a request sent to a host.
+
+        Parameters:
+            endpoint (Endpoint): The host of the request.
+            success (bool): False for a transport error or a 5xx response.
+            latency (float, optional): Seconds taken by the request.
+
+        Returns:
+            str: The new state of the circuit of the host if it changed, None otherwise.
+        """
+        with self._lock:
+            endpoint.requests += 1
+            if not success:
+                endpoint.failures += 1
+            elif latency is not None:
+                endpoint.latency = latency if endpoint.latency is None else (
+                    self.smoothing * latency + (1 - self.smoothing) * endpoint.latency)
+        if success:
+            return endpoint.breaker.record_success()
+        return endpoint.breaker.record_failure()
+
+    def stats(self):
+        """
+        Returns:
+            list: The statistics of each host, in order.
+        """
+        return [endpoint.stats() for endpoint in self.endpoints]
@@ -0,0 +1,138 @@
+import threading
+from collections import deque
+
+class HedgePolicy:
+    """
+    Decides when a slow call is sent a second time.
+
+    When a call has not returned after the `percentile` of the recent latencies (or a
+    fixed `delay`), a duplicate request is sent, to another host when the client has
+    several endpoints, and the first successful answer is used. Hedges are paid from a
+    budget earning `budget` request per call, so that they never add more than `budget`
+    (e.g. 5%) to the requests sent.
+
+    A single instance is thread-safe and can be shared by several clients.
+    """
+
+    def __init__(self, delay=None, percentile=0.95, min_delay=0.01, max_delay=1.0, budget=0.05,
+                 burst=10, methods=('GET',), other_host=True, samples=1000, min_samples=20):
+        """
+        Initialize the HedgePolicy instance.
+
+        Parameters:
+            delay (float, optional): Fixed seconds before hedging. Defaults to None (use
+                                     the `percentile` of the recent latencies).
+            percentile (float, optional): Percentile of the latencies after which a call is
+                                          hedged. Defaults to 0.95.
+            min_delay (float, optional): Lower bound of the computed delay, in seconds.
+            max_delay (float, optional): Upper bound of the computed delay, used until
+                                         `min_samples` latencies are known.
+            budget (float, optional): Ratio of extra requests allowed. Defaults to 0.05.
+            burst (int, optional): Maximum number of hedges saved up by quiet periods.
+            methods (tuple, optional): HTTP methods hedged. Defaults to ('GET',).
+            other_host (bool, optional): Send the hedge to another endpoint when possible.
+            samples (int, optional): Number of recent latencies kept.
+            min_samples (int, optional): Latencies needed before computing the delay.
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self.methods = tuple(methods)
+        self.other_host = other_host
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=samples)
+        self._computed = None
+        self._observed = 0
+        self._tokens = 0.0
+        self._calls = 0
+        self._hedges = 0
+        self._wins = 0
+        self._exhausted = 0
+
+    def start_call(self):
+        """
+        Registers a hedgeable call, crediting the budget.
+
+        Returns:
+            float: Seconds to wait for the answer before hedging.
+        """
+        with self._lock:
+            self._calls += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+            return self._get_delay()
+
+    def acquire(self):
+        """
+        Takes a hedge from the budget.
+
+        Returns:
+            bool: True if the call can be hedged.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                self._exhausted += 1
+                return False
+            self._tokens -= 1
+            self._hedges += 1
+            return True
+
+    def release(self):
+        """
+        Gives back a hedge taken from the budget but not sent.
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+            self._hedges -= 1
+
+    def observe(self, latency):
+        """
+        Records the latency of a first request, the delay being computed again every
+        50 latencies.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._observed += 1
+            if self._observed % 50 == 0:
+                self._computed = None
+
+    def record_win(self):
+        """
+        Records a call answered by its hedge.
+        """
+        with self._lock:
+            self._wins += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: The number of hedgeable calls, hedges sent, hedges answering first,
+                  hedges refused by the budget, and the current delay.
+        """
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'hedges': self._hedges,
+                'wins': self._wins,
+                'budget_exhausted': self._exhausted,
+                'hedge_ratio': self._hedges / self._calls if self._calls else 0.0,
+                'delay': self._get_delay(),
+            }
+
+    def _get_delay(self):
+        """
+        Returns the fixed delay, or the percentile of the recent latencies, computed once
+        per 50 latencies. The lock must be held.
+        """
+        if self.delay is not None:
+            return self.delay
+        if len(self._latencies) < self.min_samples:
+            return self.max_delay
+        if self._computed is None:
+            latencies = sorted(self._latencies)
+            value = latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))]
+            self._computed = min(max(value, self.min_delay), self.max_delay)
+        return self._computed
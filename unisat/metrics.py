@@ -0,0 +1,313 @@
+import logging
+import threading
+from .routes import ROUTES
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+# Patterns of the routes of the UDS modules, used to group the metrics of calls by endpoint
+ROUTE_TEMPLATES = [(endpoint.pattern, endpoint.template) for endpoint in ROUTES.values()]
+
+def route_template(route):
+    """
+    Returns the route with its identifiers (txid, address, ticker, ...) replaced by
+    placeholders, so that metrics are grouped by endpoint.
+
+    Parameters:
+        route (str): The API route of a call.
+
+    Returns:
+        str: The route template, the route itself if it is unknown.
+    """
+    for (pattern, template) in ROUTE_TEMPLATES:
+        if pattern.match(route):
+            return template
+    return route
+
+class Histogram:
+    """
+    A cumulative histogram of durations, with Prometheus style buckets.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.bounds = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Records a duration in seconds.
+        """
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for (i, bound) in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """
+        Estimates a quantile, as the upper bound of the bucket holding it.
+
+        Returns:
+            float: The estimated quantile in seconds, None without observation.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for (bound, count) in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Count, sum, max, estimated p50/p99 and cumulative bucket counts.
+        """
+        cumulative, buckets = 0, {}
+        for (bound, count) in zip(self.bounds, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'count': self.count, 'sum': self.sum, 'max': self.max,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99), 'buckets': buckets}
+
+class RouteMetrics:
+    """
+    Metrics of the calls made to one endpoint.
+    """
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.ttfb = Histogram()
+        self.decode = Histogram()
+        self.requests = 0
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.retry_wait = 0.0
+        self.rate_limited = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_received = 0
+        self.status_codes = {}
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: The metrics of the endpoint.
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'calls': self.calls,
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'retry_wait': self.retry_wait,
+            'rate_limited': self.rate_limited,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_ratio': self.cache_hits / lookups if lookups else 0.0,
+            'bytes_received': self.bytes_received,
+            'status_codes': dict(self.status_codes),
+            'latency': self.latency.snapshot(),
+            'ttfb': self.ttfb.snapshot(),
+            'decode': self.decode.snapshot(),
+        }
+
+class Metrics:
+    """
+    Instrumentation of the API calls made by a client.
+
+    Every HTTP request and every `call()` is recorded by endpoint: latency, time to
+    first byte and decode time histograms, status codes, `ClientError` count, retries,
+    rate limiter wait, cache hits and bytes received. `snapshot()` returns them as a
+    dict, and hooks registered with `add_hook()` receive each event as it happens, to
+    export them to Prometheus, OpenTelemetry or any other system.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._hooks = []
+        self.rate_limiter_wait = 0.0
+
+    def add_hook(self, hook):
+        """
+        Registers a callback called with a dict describing each event.
+
+        Events have an `event` key: 'request' for each HTTP request (`route`, `method`,
+        `status`, `latency`, `ttfb`, `decode`, `bytes`), 'call' for each `call()` (`route`,
+        `method`, `attempts`, `retry_wait`, `error`, `cached`).
+
+        Parameters:
+            hook (callable): hook(event), called on the thread making the call.
+        """
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Unregisters a callback registered with `add_hook()`.
+        """
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def observe_request(self, method, route, status, latency, ttfb, decode, size,
+                        rate_limited=False):
+        """
+        Records an HTTP request.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            route (str): The API route of the request.
+            status (int): The HTTP status code, None if no response was received.
+            latency (float): Seconds from sending the request to the decoded response.
+            ttfb (float): Seconds from sending the request to the response headers.
+            decode (float): Seconds spent decoding the JSON body.
+            size (int): Size of the response body in bytes.
+            rate_limited (bool, optional): True for a 403 'exceeds rate limit' response.
+        """
+        route = route_template(route)
+        with self._lock:
+            metrics = self._get_route(route)
+            metrics.requests += 1
+            metrics.status_codes[status] = metrics.status_codes.get(status, 0) + 1
+            if rate_limited:
+                metrics.rate_limited += 1
+            metrics.latency.observe(latency)
+            if ttfb is not None:
+                metrics.ttfb.observe(ttfb)
+            if decode is not None:
+                metrics.decode.observe(decode)
+            metrics.bytes_received += size
+            hooks = list(self._hooks)
+        self._emit(hooks, {'event': 'request', 'method': method, 'route': route,
+                           'status': status, 'latency': latency, 'ttfb': ttfb,
+                           'decode': decode, 'bytes': size, 'rate_limited': rate_limited})
+
+    def observe_call(self, method, route, attempts, retry_wait, error=None, cached=False):
+        """
+        Records a `call()`, after its retries.
+
+        Parameters:
+            method (str): The HTTP method of the call.
+            route (str): The API route of the call.
+            attempts (int): Number of HTTP requests sent, 0 for a cached response.
+            retry_wait (float): Seconds spent waiting between attempts.
+            error (ClientError, optional): The error raised by the call, if any.
+            cached (bool, optional): True if the response came from the cache.
+        """
+        route = route_template(route)
+        with self._lock:
+            metrics = self._get_route(route)
+            metrics.calls += 1
+            metrics.retries += max(attempts - 1, 0)
+            metrics.retry_wait += retry_wait
+            if error is not None:
+                metrics.errors += 1
+            if cached:
+                metrics.cache_hits += 1
+            hooks = list(self._hooks)
+        self._emit(hooks, {'event': 'call', 'method': method, 'route': route,
+                           'attempts': attempts, 'retry_wait': retry_wait, 'error': error,
+                           'cached': cached})
+
+    def observe_cache_miss(self, route):
+        """
+        Records a call not found in the cache.
+        """
+        with self._lock:
+            self._get_route(route_template(route)).cache_misses += 1
+
+    def observe_rate_limiter_wait(self, wait):
+        """
+        Records the seconds a call waited for the rate limiter.
+        """
+        with self._lock:
+            self.rate_limiter_wait += wait
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: The totals over all endpoints and the metrics of each endpoint.
+        """
+        with self._lock:
+            routes = {route: metrics.snapshot() for (route, metrics) in self._routes.items()}
+            rate_limiter_wait = self.rate_limiter_wait
+        totals = {key: sum(route[key] for route in routes.values())
+                  for key in ('calls', 'requests', 'errors', 'retries', 'retry_wait',
+                              'rate_limited', 'cache_hits', 'cache_misses', 'bytes_received')}
+        lookups = totals['cache_hits'] + totals['cache_misses']
+        totals['cache_hit_ratio'] = totals['cache_hits'] / lookups if lookups else 0.0
+        totals['rate_limiter_wait'] = rate_limiter_wait
+        return {'totals': totals, 'routes': routes}
+
+    def prometheus_text(self, prefix='unisat'):
+        """
+        Formats the metrics in the Prometheus text exposition format.
+
+        Parameters:
+            prefix (str, optional): Prefix of the metric names. Defaults to 'unisat'.
+
+        Returns:
+            str: The metrics, ready to be served on a `/metrics` endpoint.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        counters = ('calls', 'requests', 'errors', 'retries', 'rate_limited', 'cache_hits',
+                    'cache_misses', 'bytes_received')
+        for name in counters:
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            for (route, metrics) in snapshot['routes'].items():
+                lines.append(f'{prefix}_{name}_total{{route="{route}"}} {metrics[name]}')
+        lines.append(f'# TYPE {prefix}_rate_limiter_wait_seconds_total counter')
+        lines.append(f'{prefix}_rate_limiter_wait_seconds_total '
+                     f'{snapshot["totals"]["rate_limiter_wait"]}')
+        for name in ('latency', 'ttfb', 'decode'):
+            lines.append(f'# TYPE {prefix}_{name}_seconds histogram')
+            for (route, metrics) in snapshot['routes'].items():
+                histogram = metrics[name]
+                for (bound, count) in histogram['buckets'].items():
+                    bound = '+Inf' if bound == 'inf' else bound
+                    lines.append(f'{prefix}_{name}_seconds_bucket{{route="{route}",le="{bound}"}}'
+                                 f' {count}')
+                lines.append(f'{prefix}_{name}_seconds_sum{{route="{route}"}} {histogram["sum"]}')
+                lines.append(f'{prefix}_{name}_seconds_count{{route="{route}"}} '
+                             f'{histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """
+        Clears every metric, hooks are kept.
+        """
+        with self._lock:
+            self._routes = {}
+            self.rate_limiter_wait = 0.0
+
+    def _get_route(self, route):
+        """
+        Returns the metrics of an endpoint, created on first use. The lock must be held.
+        """
+        metrics = self._routes.get(route)
+        if metrics is None:
+            metrics = self._routes[route] = RouteMetrics()
+        return metrics
+
+    def _emit(self, hooks, event):
+        """
+        Calls the hooks with an event, a failing hook is logged without breaking the API
+        call.
+        """
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception('metrics hook %r failed on a %s event', hook, event['event'])
@@ -0,0 +1,195 @@
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from .client import ClientError
+
+# Combined view of a wallet: `balance` is the data of `get_address_balance`, `btc_utxo`
+# and `inscription_utxo` every UTXO of the address, `brc20` every record of its BRC20
+# summary with the `get_brc20_info` data of the ticker under an `info` key. `errors`
+# maps the name of the failed parts ('balance', 'btc_utxo', 'inscription_utxo', 'brc20',
+# 'brc20_info') to their ClientError, the other parts being complete.
+WalletPortfolio = namedtuple('WalletPortfolio', ['address', 'balance', 'btc_utxo',
+                                                 'inscription_utxo', 'brc20', 'errors'])
+
+class _Wallet:
+    """
+    Parts of a wallet fetched so far.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self.parts = {'balance': None, 'btc_utxo': [], 'inscription_utxo': [], 'brc20': []}
+        self.errors = {}
+        self.pending = 0
+        self.tickers = set()
+
+    def result(self, infos):
+        brc20 = [dict(record, info=infos.get(record.get('ticker')))
+                 for record in self.parts['brc20']]
+        return WalletPortfolio(self.address, self.parts['balance'], self.parts['btc_utxo'],
+                               self.parts['inscription_utxo'], brc20, self.errors)
+
+class PortfolioEngine:
+    """
+    Values a list of wallets: the balance, BTC UTXO, inscription UTXO and BRC20 summary
+    of every address are fetched concurrently on a bounded pool of threads, each
+    paginated endpoint being walked to completion, and `get_brc20_info` is called once
+    per ticker for the whole run.
+
+    Wallets are yielded as soon as all their parts are fetched, and at most `window`
+    wallets are in flight so that thousands of addresses use a bounded amount of memory.
+    """
+
+    PARTS = ('balance', 'btc_utxo', 'inscription_utxo', 'brc20')
+
+    def __init__(self, client, max_workers=None, page_size=100, brc20_info=True, window=None):
+        """
+        Initialize the PortfolioEngine instance.
+
+        Parameters:
+            client (Client): The client used to call the API.
+            max_workers (int, optional): Number of calls in flight. Defaults to the
+                                         connection pool size of the client.
+            page_size (int, optional): Number of records requested per API call.
+            brc20_info (bool, optional): Add the `get_brc20_info` data of each ticker held.
+            window (int, optional): Maximum number of wallets in flight. Defaults to
+                                    4 times `max_workers`.
+        """
+        self.client = client
+        self.max_workers = max_workers or client.pool_maxsize
+        self.page_size = page_size
+        self.brc20_info = brc20_info
+        self.window = window or self.max_workers * 4
+        self.stats = {}
+
+    def get_portfolios(self, addresses):
+        """
+        Returns:
+            dict: The WalletPortfolio of each address, in completion order.
+        """
+        return {portfolio.address: portfolio for portfolio in self.iter_portfolios(addresses)}
+
+    def iter_portfolios(self, addresses):
+        """
+        Yields the WalletPortfolio of each address, in completion order. Duplicated
+        addresses are fetched once. `self.stats` is updated when the iteration ends.
+
+        Parameters:
+            addresses (iterable): Addresses to value, consumed lazily.
+        """
+        started = time.perf_counter()
+        before = self._get_totals()
+        wallets, infos, info_waiters, futures = {}, {}, {}, {}
+        seen, count = set(), 0
+        iterator = iter(addresses)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='unisat')
+        try:
+            while True:
+                while len(wallets) < self.window:
+                    address = next(iterator, None)
+                    if address is None:
+                        break
+                    if address in seen:
+                        continue
+                    seen.add(address)
+                    wallet = wallets[address] = _Wallet(address)
+                    for part in self.PARTS:
+                        futures[pool.submit(self._fetch, part, address)] = (wallet, part)
+                    wallet.pending = len(self.PARTS)
+                if not futures:
+                    break
+                (done, _) = wait(list(futures), return_when=FIRST_COMPLETED)
+                completed = []
+                for future in done:
+                    (wallet, part) = futures.pop(future)
+                    if part == 'brc20_info':
+                        ticker = wallet
+                        try:
+                            infos[ticker] = future.result()
+                        except ClientError as exc:
+                            infos[ticker] = None
+                            for waiter in info_waiters[ticker]:
+                                waiter.errors['brc20_info'] = exc
+                        waiting = info_waiters.pop(ticker)
+                    else:
+                        try:
+                            wallet.parts[part] = future.result()
+                        except ClientError as exc:
+                            wallet.errors[part] = exc
+                        if part == 'brc20' and self.brc20_info:
+                            for record in wallet.parts['brc20']:
+                                ticker = record.get('ticker')
+                                if ticker is None or ticker in wallet.tickers:
+                                    continue
+                                wallet.tickers.add(ticker)
+                                if ticker in infos:
+                                    continue
+                                if ticker not in info_waiters:
+                                    info_waiters[ticker] = []
+                                    info = pool.submit(self._fetch, 'brc20_info', ticker)
+                                    futures[info] = (ticker, 'brc20_info')
+                                info_waiters[ticker].append(wallet)
+                                wallet.pending += 1
+                        waiting = [wallet]
+                    for waiter in waiting:
+                        waiter.pending -= 1
+                        if not waiter.pending:
+                            completed.append(waiter)
+                for wallet in completed:
+                    del wallets[wallet.address]
+                    count += 1
+                    yield wallet.result(infos)
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+            self._set_stats(started, before, count, len(infos))
+
+    def _fetch(self, part, key):
+        """
+        Fetches one part of a wallet (or the info of a ticker), on a worker thread.
+        """
+        general = self.client.uds.general
+        brc20 = self.client.uds.brc20
+        if part == 'balance':
+            return general.get_address_balance(key)['data']
+        if part == 'btc_utxo':
+            return list(general.iter_btc_utxo(key, self.page_size))
+        if part == 'inscription_utxo':
+            return list(general.iter_inscription_utxo(key, self.page_size))
+        if part == 'brc20':
+            return list(brc20.iter_address_brc20_summary(key, self.page_size))
+        return brc20.get_brc20_info(key)['data']
+
+    def _get_totals(self):
+        """
+        Returns:
+            dict: The call and request totals of the client metrics, None if disabled.
+        """
+        if self.client.metrics is None:
+            return None
+        return self.client.metrics.snapshot()['totals']
+
+    def _set_stats(self, started, before, count, tickers):
+        """
+        Records the wall time and the number of calls and HTTP requests of a run. The
+        counts come from the client metrics and include the other calls made by the
+        client meanwhile, they are None when metrics are disabled.
+        """
+        seconds = time.perf_counter() - started
+        after = self._get_totals()
+        delta = {key: after[key] - before[key] if before else None
+                 for key in ('calls', 'requests', 'errors')} if after else {}
+        self.stats = {
+            'addresses': count,
+            'tickers': tickers,
+            'seconds': seconds,
+            'addresses_per_second': count / seconds if seconds else 0.0,
+            'calls': delta.get('calls'),
+            'requests': delta.get('requests'),
+            'errors': delta.get('errors'),
+            'max_workers': self.max_workers,
+        }
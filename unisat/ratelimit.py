@@ -0,0 +1,128 @@
+import threading
+import time
+
+class RateLimiter:
+    """
+    A token bucket pacing outgoing API calls.
+
+    Tokens are refilled at `rate` per second up to `burst`. Each call takes one token,
+    calls finding the bucket empty reserve a future token and wait for it, so that the
+    outgoing traffic stays at the configured quota instead of being rejected with 403.
+
+    A single instance is thread-safe and can be shared by several `Client` and
+    `AsyncClient` instances using the same API key.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Initialize the RateLimiter instance.
+
+        Parameters:
+            rate (float): Number of calls allowed per second.
+            burst (int, optional): Maximum number of calls sent back to back.
+                                   Defaults to `rate` (at least 1).
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._delayed_calls = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def reserve(self, max_wait=None):
+        """
+        Takes one token from the bucket.
+
+        Parameters:
+            max_wait (float, optional): Leave the token if it would have to be waited for
+                                        longer than this number of seconds.
+
+        Returns:
+            float: Number of seconds the caller has to wait before sending its call,
+                   None if no token was taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if max_wait is not None and (1 - self._tokens) / self.rate > max_wait:
+                return None
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._calls += 1
+            if delay > 0:
+                self._delayed_calls += 1
+                self._total_wait += delay
+                self._max_wait = max(self._max_wait, delay)
+            return delay
+
+    def try_acquire(self):
+        """
+        Takes one token only if one is available right away.
+
+        Returns:
+            bool: True if a token was taken, False if the call would have to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._calls += 1
+            return True
+
+    def acquire(self, max_wait=None):
+        """
+        Blocks the current thread until a call is allowed.
+
+        Parameters:
+            max_wait (float, optional): Give up without waiting if the call would have to
+                                        wait longer than this number of seconds.
+
+        Returns:
+            float: Number of seconds waited, None if the call was not allowed.
+        """
+        delay = self.reserve(max_wait)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, max_wait=None):
+        """
+        Suspends the current coroutine until a call is allowed.
+
+        Parameters:
+            max_wait (float, optional): Give up without waiting if the call would have to
+                                        wait longer than this number of seconds.
+
+        Returns:
+            float: Number of seconds waited, None if the call was not allowed.
+        """
+        # imported here, asyncio is only loaded by the applications running a loop
+        import asyncio
+        delay = self.reserve(max_wait)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self):
+        """
+        Returns the counters of the rate limiter.
+
+        Returns:
+            dict: Number of calls, number of delayed calls, total and maximum wait in seconds.
+        """
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'delayed_calls': self._delayed_calls,
+                'total_wait': self._total_wait,
+                'max_wait': self._max_wait,
+            }
@@ -0,0 +1,57 @@
+class Response(dict):
+    """
+    An API response: the decoded JSON body with the HTTP status code and the client side
+    fields (e.g. `retry_stats`) merged in, as the client always returned.
+
+    It is a plain dict (`response['data']`, `json.dumps(response)`) with the usual fields
+    also available as attributes.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, http_status_code, payload, extra=None):
+        """
+        Initialize the Response instance.
+
+        Parameters:
+            http_status_code (int): The HTTP status code of the response.
+            payload (dict): The decoded JSON body, with the `code`, `msg` and `data` keys.
+            extra (dict, optional): Client side fields added to the response.
+        """
+        super().__init__(http_status_code=http_status_code)
+        self.update(payload)
+        self['http_status_code'] = http_status_code
+        if extra:
+            self.update(extra)
+
+    @property
+    def http_status_code(self):
+        """HTTP status code of the response."""
+        return self.get('http_status_code')
+
+    @property
+    def code(self):
+        """API status code, 0 on success."""
+        return self.get('code')
+
+    @property
+    def msg(self):
+        """API status message."""
+        return self.get('msg')
+
+    @property
+    def data(self):
+        """API response data."""
+        return self.get('data')
+
+    @property
+    def retry_stats(self):
+        """Number of attempts made and seconds spent waiting between them."""
+        return self.get('retry_stats')
+
+    def copy(self):
+        """
+        Returns:
+            Response: A shallow copy of the response.
+        """
+        return Response(self.http_status_code, self)
@@ -0,0 +1,119 @@
+import random
+
+def is_rate_limited(content):
+    """
+    Returns:
+        bool: True for a 403 'exceeds rate limit' response, other 403 being denials.
+    """
+    return content['http_status_code'] == 403 and content.get('msg') == 'exceeds rate limit'
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed API call is sent again.
+
+    Delays grow exponentially from `backoff` up to `max_backoff` and are randomized
+    with a jitter ratio so that concurrent clients do not retry in lockstep. A
+    `Retry-After` header sent by the API takes precedence over the computed delay.
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30, jitter=0.5,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_rate_limit=True,
+                 retry_exceptions=None,
+                 retry_methods=('GET',), respect_retry_after=True, deadline=None):
+        """
+        Initialize the RetryPolicy instance.
+
+        Parameters:
+            max_attempts (int, optional): Maximum number of attempts per call, the first one
+                                          included. Defaults to 3.
+            backoff (float, optional): Delay in seconds before the first retry.
+            max_backoff (float, optional): Upper bound of the delay between two attempts.
+            jitter (float, optional): Ratio of the delay randomized, from 0 (fixed delays)
+                                      to 1 (delays drawn between 0 and the backoff).
+            retry_statuses (tuple, optional): HTTP status codes retried.
+            retry_rate_limit (bool, optional): Retry the 403 'exceeds rate limit' responses.
+            retry_exceptions (tuple, optional): `requests` exceptions retried, only for
+                                                `retry_methods` as the request may have
+                                                reached the server. Defaults to
+                                                (requests.ConnectionError, requests.Timeout).
+            retry_methods (tuple, optional): HTTP methods retried after an exception.
+            respect_retry_after (bool, optional): Use the `Retry-After` header when present.
+            deadline (float, optional): Maximum number of seconds spent on a call, retries
+                                        included. Defaults to None (no deadline).
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_rate_limit = retry_rate_limit
+        self.retry_exceptions = None if retry_exceptions is None else tuple(retry_exceptions)
+        self.retry_methods = tuple(retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.deadline = deadline
+
+    def is_retryable(self, method, content=None, error=None):
+        """
+        Tells whether the outcome of an attempt is worth retrying.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            content (dict, optional): The response content, if a response was received.
+            error (ClientError, optional): The error raised while sending the request.
+
+        Returns:
+            bool: True if the call should be retried.
+        """
+        if error is not None:
+            cause = error.__cause__
+            if self.retry_exceptions is None:
+                # requests is loaded by then, the client imports it on its first call
+                import requests
+                self.retry_exceptions = (requests.ConnectionError, requests.Timeout)
+            return method in self.retry_methods and isinstance(cause, self.retry_exceptions)
+        if is_rate_limited(content):
+            return self.retry_rate_limit
+        return content['http_status_code'] in self.retry_statuses
+
+    def compute_delay(self, attempt, retry_after=None):
+        """
+        Computes the delay before the next attempt.
+
+        Parameters:
+            attempt (int): Number of attempts already made.
+            retry_after (str, optional): Value of the `Retry-After` header, in seconds.
+
+        Returns:
+            float: Number of seconds to wait.
+        """
+        if self.respect_retry_after and retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def next_delay(self, method, attempt, elapsed, content=None, error=None):
+        """
+        Decides whether an attempt is retried and how long to wait before.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            attempt (int): Number of attempts already made.
+            elapsed (float): Number of seconds spent on the call so far.
+            content (dict, optional): The response content, if a response was received.
+            error (ClientError, optional): The error raised while sending the request.
+
+        Returns:
+            float: Number of seconds to wait before the next attempt, None to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if not self.is_retryable(method, content, error):
+            return None
+        retry_after = content.get('retry_after') if content is not None else None
+        delay = self.compute_delay(attempt, retry_after)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
@@ -0,0 +1,186 @@
+import re
+from urllib.parse import quote
+from urllib.parse import unquote
+
+class Param:
+    """
+    A query parameter of a route.
+    """
+
+    def __init__(self, name, kind=int, required=True, key=None):
+        """
+        Parameters:
+            name (str): Name of the argument of the UDS method.
+            kind (type, optional): int or str. Defaults to int.
+            required (bool, optional): Raise before any I/O when missing. Defaults to True.
+            key (str, optional): Name sent to the API. Defaults to `name`.
+        """
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.key = key or name
+
+    def check(self, route, value):
+        """
+        Validates a value of the parameter.
+
+        Returns:
+            object: The value, None if missing and optional.
+
+        Raises:
+            ValueError: If the value is missing or invalid.
+        """
+        return _check(route, self.name, self.kind, self.required, value)
+
+class Route:
+    """
+    An endpoint of the API: HTTP method, route template and parameter schema.
+
+    `build()` validates the arguments of a call and returns the method, the route and
+    the query parameters to give to `Client.call()`, the identifiers being URL encoded
+    in the route.
+    """
+
+    def __init__(self, name, template, query=(), method='GET', paging=None):
+        """
+        Parameters:
+            name (str): Name of the UDS method.
+            template (str): Route with `{placeholders}` for the path parameters.
+            query (tuple, optional): Param list of the query parameters.
+            method (str, optional): HTTP method. Defaults to 'GET'.
+            paging (tuple, optional): Names of the offset and page size parameters of
+                                      paginated routes, e.g. ('cursor', 'size').
+        """
+        self.name = name
+        self.template = template
+        self.query = tuple(query)
+        self.method = method
+        self.paging = paging
+        self.path_params = tuple(re.findall(r'{(\w+)}', template))
+        self.pattern = re.compile('^' + re.sub(r'\\{(\w+)\\}', r'(?P<\1>[^/]+)',
+                                               re.escape(template)) + '$')
+        self.params = self.path_params + tuple(param.name for param in self.query)
+        self._names = frozenset(self.params)
+
+    def build(self, *args, **values):
+        """
+        Prepares a call of the route.
+
+        Parameters:
+            *args: The path then the query parameters, in the order of `params`.
+            **values: The parameters by name. None leaves an optional query parameter out.
+
+        Returns:
+            tuple: The HTTP method, the route and the query parameters (None without any).
+
+        Raises:
+            ValueError: If a parameter is unknown, missing or invalid.
+        """
+        if args:
+            if len(args) > len(self.params):
+                raise ValueError(f'{self.name}: {len(self.params)} parameters expected, '
+                                 f'got {len(args)}')
+            values.update(zip(self.params, args))
+        if not self._names.issuperset(values):
+            unknown = ', '.join(sorted(set(values) - self._names))
+            raise ValueError(f'{self.name}: unknown parameter {unknown}')
+        route = self.template
+        if self.path_params:
+            route = route.format(**{name: quote(str(_check(self.name, name, str, True,
+                                                           values.get(name))), safe='')
+                                    for name in self.path_params})
+        params = None
+        for param in self.query:
+            value = param.check(self.name, values.get(param.name))
+            if value is not None:
+                if params is None:
+                    params = {}
+                params[param.key] = value
+        return (self.method, route, params)
+
+    def match(self, route):
+        """
+        Returns:
+            dict: The path parameters of a route built from this template, None if the
+                  route does not match.
+        """
+        match = self.pattern.match(route)
+        if match is None:
+            return None
+        return {name: unquote(value) for (name, value) in match.groupdict().items()}
+
+def _check(route, name, kind, required, value):
+    """
+    Validates a parameter value: integers must be non-negative ints (or strings of
+    digits), strings must not be empty.
+    """
+    if value is None:
+        if required:
+            raise ValueError(f'{route}: {name} is required')
+        return None
+    if kind is int:
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f'{route}: {name} must be a non-negative integer, got {value!r}')
+        return value
+    if not isinstance(value, (str, int)) or isinstance(value, bool) or value == '':
+        raise ValueError(f'{route}: {name} must be a non-empty string, got {value!r}')
+    return value
+
+START = (Param('start'), Param('limit'))
+CURSOR = (Param('cursor'), Param('size'))
+
+# Every endpoint of the UDS modules, by method name
+ROUTES = {route.name: route for route in (
+    # General
+    Route('get_blockchain_info', '/v1/indexer/blockchain/info'),
+    Route('get_block_transactions', '/v1/indexer/block/{height}/txs', CURSOR,
+          paging=('cursor', 'size')),
+    Route('get_tx_info', '/v1/indexer/tx/{txid}'),
+    Route('get_tx_inputs', '/v1/indexer/tx/{txid}/ins', CURSOR, paging=('cursor', 'size')),
+    Route('get_tx_outputs', '/v1/indexer/tx/{txid}/outs', CURSOR, paging=('cursor', 'size')),
+    Route('get_address_balance', '/v1/indexer/address/{address}/balance'),
+    Route('get_address_history', '/v1/indexer/address/{address}/history', CURSOR,
+          paging=('cursor', 'size')),
+    Route('get_btc_utxo', '/v1/indexer/address/{address}/utxo-data', CURSOR,
+          paging=('cursor', 'size')),
+    Route('get_inscription_utxo', '/v1/indexer/address/{address}/inscription-utxo-data',
+          CURSOR, paging=('cursor', 'size')),
+    Route('get_inscription_info', '/v1/indexer/inscription/info/{inscription_id}'),
+    # BRC20
+    Route('get_best_block_height', '/v1/indexer/brc20/bestheight'),
+    Route('get_brc20_list', '/v1/indexer/brc20/list', START, paging=('start', 'limit')),
+    Route('get_brc20_info', '/v1/indexer/brc20/{ticker}/info'),
+    Route('get_brc20_holders', '/v1/indexer/brc20/{ticker}/holders', START,
+          paging=('start', 'limit')),
+    Route('get_brc20_history', '/v1/indexer/brc20/{ticker}/history',
+          (Param('type_', str, False, 'type'), Param('height', int, False)) + START,
+          paging=('start', 'limit')),
+    Route('get_brc20_tx_history', '/v1/indexer/brc20/{ticker}/tx/{txid}/history',
+          (Param('type_', str, False, 'type'),) + START, paging=('start', 'limit')),
+    Route('get_address_brc20_summary', '/v1/indexer/address/{address}/brc20/summary', START,
+          paging=('start', 'limit')),
+    Route('get_address_brc20_ticker_info', '/v1/indexer/address/{address}/brc20/{ticker}/info'),
+    Route('get_address_brc20_history', '/v1/indexer/address/{address}/brc20/{ticker}/history',
+          (Param('type_', str, False, 'type'),) + START, paging=('start', 'limit')),
+    Route('get_transferable_inscription',
+          '/v1/indexer/address/{address}/brc20/{ticker}/transferable-inscriptions', START,
+          paging=('start', 'limit')),
+)}
+
+def match(route):
+    """
+    Finds the endpoint of a route.
+
+    Parameters:
+        route (str): The API route of a call, e.g. '/v1/indexer/tx/<txid>/ins'.
+
+    Returns:
+        tuple: The Route and its path parameters, None if the route is unknown.
+    """
+    for endpoint in ROUTES.values():
+        values = endpoint.match(route)
+        if values is not None:
+            return (endpoint, values)
+    return None
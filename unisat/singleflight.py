@@ -0,0 +1,109 @@
+import threading
+
+def _copy(result):
+    """
+    Gives each coalesced caller its own copy of a response, the payload being shared.
+    """
+    return result.copy() if hasattr(result, 'copy') else result
+
+class _Call:
+    """
+    An API call in flight, waited by the callers coalesced on it.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Deduplicates identical API calls in flight.
+
+    The first caller of a key sends the request, the callers asking for the same key
+    before it completes wait for it and get the same result, or the same exception.
+    Works for threads (`do`) and for coroutines (`do_async`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self._count = 0
+        self._coalesced = 0
+
+    def do(self, key, function):
+        """
+        Calls `function`, unless a call with the same key is already in flight.
+
+        Parameters:
+            key (hashable): Identifies identical calls.
+            function (callable): Sends the call, without arguments.
+
+        Returns:
+            object: The result of `function`.
+        """
+        with self._lock:
+            self._count += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy(call.result)
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key, function):
+        """
+        Awaits `function()`, unless a call with the same key is already in flight.
+
+        Parameters:
+            key (hashable): Identifies identical calls.
+            function (callable): Returns the coroutine sending the call, without arguments.
+
+        Returns:
+            object: The result of the coroutine.
+        """
+        # imported here, asyncio is only loaded by the applications running a loop
+        import asyncio
+        key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self._count += 1
+            task = self._tasks.get(key)
+            leader = task is None
+            if leader:
+                task = self._tasks[key] = asyncio.ensure_future(function())
+                task.add_done_callback(lambda _: self._forget_task(key))
+            else:
+                self._coalesced += 1
+        result = await asyncio.shield(task)
+        return result if leader else _copy(result)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of calls and number of calls coalesced on another one.
+        """
+        with self._lock:
+            return {'calls': self._count, 'coalesced': self._coalesced}
+
+    def _forget_task(self, key):
+        """
+        Removes a completed coroutine call from the calls in flight.
+        """
+        with self._lock:
+            self._tasks.pop(key, None)
@@ -0,0 +1,396 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from .cache import UNCONFIRMED_HEIGHT
+from . import codec
+from .response import Response
+from .routes import ROUTES
+
+TX = 'tx'
+INPUTS = 'ins'
+OUTPUTS = 'outs'
+INSCRIPTION = 'inscription'
+
+# Endpoints served by the store, the kind of object they return and its id parameter
+KINDS = [
+    (ROUTES['get_tx_inputs'], INPUTS, 'txid'),
+    (ROUTES['get_tx_outputs'], OUTPUTS, 'txid'),
+    (ROUTES['get_tx_info'], TX, 'txid'),
+    (ROUTES['get_inscription_info'], INSCRIPTION, 'inscription_id'),
+]
+
+# Number of reads whose access times are kept in memory before being written
+ACCESS_FLUSH = 1000
+
+class ObjectStore:
+    """
+    A local sqlite store of the chain objects that never change once confirmed: tx
+    info, the full list of inputs and outputs of a tx, and inscription info, indexed by
+    txid and inscription id.
+
+    Given as `store` to a client, it is checked before the network and filled with the
+    responses received, any page of inputs or outputs being served from the full list.
+    `prefetch()` fills it with a list of ids in bulk. When `max_bytes` or `max_entries`
+    is exceeded, the least recently read objects are evicted.
+    """
+
+    def __init__(self, path, max_bytes=None, max_entries=None, compress=True,
+                 inscription_ttl=3600):
+        """
+        Initialize the ObjectStore instance.
+
+        Parameters:
+            path (str): Path of the sqlite database file.
+            max_bytes (int, optional): Maximum size of the stored objects. Defaults to None
+                                       (no limit).
+            max_entries (int, optional): Maximum number of objects. Defaults to None.
+            compress (bool, optional): Compress the objects with zlib. Defaults to True.
+            inscription_ttl (float, optional): Seconds an inscription info is kept, as its
+                                               owner (address, output) changes with its
+                                               transfers. Defaults to 3600, None to keep
+                                               it until evicted.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compress = compress
+        self.inscription_ttl = inscription_ttl
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS objects (kind TEXT NOT NULL, '
+                         'id TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                         'expires REAL, accessed REAL NOT NULL, PRIMARY KEY (kind, id))')
+        self._db.execute('CREATE INDEX IF NOT EXISTS objects_accessed ON objects (accessed)')
+        (self._count, self._bytes) = self._db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects').fetchone()
+
+    def get(self, kind, id_):
+        """
+        Returns a stored object.
+
+        Parameters:
+            kind (str): TX, INPUTS, OUTPUTS or INSCRIPTION.
+            id_ (str): The txid or the inscription id.
+
+        Returns:
+            dict|list: The `data` of the API response, None if not stored.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM objects WHERE kind = ? AND id = ?',
+                                   (kind, id_)).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._touched[(kind, id_)] = now
+            if len(self._touched) >= ACCESS_FLUSH:
+                self._flush_access()
+        return self._decode(row[0])
+
+    def put(self, kind, id_, value):
+        """
+        Stores an object, evicting the least recently read ones if a limit is exceeded.
+
+        Parameters:
+            kind (str): TX, INPUTS, OUTPUTS or INSCRIPTION.
+            id_ (str): The txid or the inscription id.
+            value (dict|list): The `data` of the API response.
+        """
+        blob = self._encode(value)
+        now = time.time()
+        expires = None
+        if kind == INSCRIPTION and self.inscription_ttl:
+            expires = now + self.inscription_ttl
+        with self._lock:
+            row = self._db.execute('SELECT size FROM objects WHERE kind = ? AND id = ?',
+                                   (kind, id_)).fetchone()
+            self._db.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)',
+                             (kind, id_, blob, len(blob), expires, now))
+            if row is None:
+                self._count += 1
+                self._bytes += len(blob)
+            else:
+                self._bytes += len(blob) - row[0]
+            if self._is_over_limits():
+                self._evict()
+
+    def missing(self, kind, ids):
+        """
+        Returns:
+            list: The ids of `ids` whose object is not stored, in order.
+        """
+        ids = list(dict.fromkeys(ids))
+        found = set()
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                found.update(row[0] for row in self._db.execute(
+                    f'SELECT id FROM objects WHERE kind = ? AND id IN ({marks}) '
+                    'AND (expires IS NULL OR expires >= ?)', (kind, *chunk, now)))
+        return [id_ for id_ in ids if id_ not in found]
+
+    def lookup(self, method, route, params):
+        """
+        Serves an API call from the store.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            route (str): The API route of the request.
+            params (dict): The parameters of the request.
+
+        Returns:
+            Response: The response content, None if the object is not stored.
+        """
+        target = self._get_target(method, route)
+        if target is None:
+            return None
+        data = self.get(*target)
+        if data is None:
+            return None
+        if target[0] in (INPUTS, OUTPUTS):
+            cursor = int((params or {}).get('cursor') or 0)
+            size = int((params or {}).get('size') or len(data))
+            data = data[cursor:cursor + size]
+        return Response(200, {'code': 0, 'msg': 'ok', 'data': data},
+                        {'retry_stats': {'attempts': 0, 'wait': 0.0}})
+
+    def save(self, method, route, params, content):
+        """
+        Stores the object returned by an API call, if it is final: a confirmed tx or
+        inscription, or a page of inputs or outputs holding the whole list, as counted by
+        the `nIn` / `nOut` of the stored tx.
+
+        Parameters:
+            method (str): The HTTP method of the request.
+            route (str): The API route of the request.
+            params (dict): The parameters of the request.
+            content (dict): The response content.
+        """
+        if content['http_status_code'] != 200 or content.get('code', 0) != 0:
+            return
+        target = self._get_target(method, route)
+        data = content.get('data')
+        if target is None or data is None:
+            return
+        (kind, id_) = target
+        if kind in (TX, INSCRIPTION):
+            if _is_confirmed(data):
+                self.put(kind, id_, data)
+            return
+        # a short page is not proof of the end of the list, the server may cap its size:
+        # only a first page holding as many items as the stored tx is kept
+        cursor = int((params or {}).get('cursor') or 0)
+        if cursor == 0 and isinstance(data, list) and len(data) == self._get_count(kind, id_):
+            self.put(kind, id_, data)
+
+    def prefetch(self, client, txids=(), inscription_ids=(), inputs=True, outputs=True,
+                 page_size=100, max_workers=None):
+        """
+        Fetches the objects of a list of ids missing from the store, concurrently with
+        `client.map()`.
+
+        Parameters:
+            client (Client): The client used to call the API.
+            txids (iterable, optional): Txs whose info, inputs and outputs are fetched.
+            inscription_ids (iterable, optional): Inscriptions whose info is fetched.
+            inputs (bool, optional): Fetch the inputs of the txs. Defaults to True.
+            outputs (bool, optional): Fetch the outputs of the txs. Defaults to True.
+            page_size (int, optional): Number of inputs or outputs requested per call.
+            max_workers (int, optional): Maximum number of calls in flight.
+
+        Returns:
+            dict: Number of objects requested, already stored, fetched and failed.
+        """
+        txids = list(txids)
+        wanted = [(TX, txids), (INSCRIPTION, list(inscription_ids))]
+        if inputs:
+            wanted.append((INPUTS, txids))
+        if outputs:
+            wanted.append((OUTPUTS, txids))
+        tasks, requested = [], 0
+        for (kind, ids) in wanted:
+            missing = self.missing(kind, ids)
+            requested += len(set(ids))
+            tasks.extend((kind, id_) for id_ in missing)
+
+        def fetch(task):
+            (kind, id_) = task
+            general = client.uds.general
+            if kind == TX:
+                value = general.get_tx_info(id_)['data']
+            elif kind == INSCRIPTION:
+                value = general.get_inscription_info(id_)['data']
+            elif kind == INPUTS:
+                value = list(general.iter_tx_inputs(id_, page_size))
+            else:
+                value = list(general.iter_tx_outputs(id_, page_size))
+            # calls made through a client using this store are already saved
+            if kind in (INPUTS, OUTPUTS) or (client.store is not self and _is_confirmed(value)):
+                self.put(kind, id_, value)
+
+        results = client.map(fetch, tasks, max_workers=max_workers)
+        errors = sum(1 for result in results if isinstance(result, Exception))
+        return {'requested': requested, 'stored': requested - len(tasks),
+                'fetched': len(tasks) - errors, 'errors': errors}
+
+    def compact(self):
+        """
+        Removes the expired objects, applies the limits and reclaims the free disk space.
+        """
+        with self._lock:
+            self._flush_access()
+            self._db.execute('DELETE FROM objects WHERE expires IS NOT NULL AND expires < ?',
+                             (time.time(),))
+            (self._count, self._bytes) = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects').fetchone()
+            if self._is_over_limits():
+                self._evict()
+            self._db.execute('VACUUM')
+            self._db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def clear(self):
+        """
+        Removes every object.
+        """
+        with self._lock:
+            self._db.execute('DELETE FROM objects')
+            self._touched.clear()
+            self._count = self._bytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of objects, their size in bytes, hits, misses, hit ratio and
+                  number of objects evicted.
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'entries': self._count,
+                'bytes': self._bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / total if total else 0.0,
+                'evicted': self._evicted,
+            }
+
+    def close(self):
+        """
+        Writes the pending access times and closes the database connection.
+        """
+        with self._lock:
+            self._flush_access()
+            self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._count
+
+    def _get_target(self, method, route):
+        """
+        Returns:
+            tuple: The kind and id of the object returned by the route, None if the route
+                   is not served by the store.
+        """
+        if method != 'GET':
+            return None
+        for (endpoint, kind, key) in KINDS:
+            values = endpoint.match(route)
+            if values is not None:
+                return (kind, values[key])
+        return None
+
+    def _get_count(self, kind, txid):
+        """
+        Returns:
+            int: The number of inputs or outputs of a stored tx, None if unknown.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT value FROM objects WHERE kind = ? AND id = ?',
+                                   (TX, txid)).fetchone()
+        if row is None:
+            return None
+        return self._decode(row[0]).get('nIn' if kind == INPUTS else 'nOut')
+
+    def _is_over_limits(self):
+        """
+        Returns:
+            bool: True if a limit is exceeded. The lock must be held.
+        """
+        return ((self.max_bytes is not None and self._bytes > self.max_bytes)
+                or (self.max_entries is not None and self._count > self.max_entries))
+
+    def _evict(self):
+        """
+        Removes the least recently read objects down to 90% of the limits. The lock must
+        be held.
+        """
+        self._flush_access()
+        max_bytes = self.max_bytes * 0.9 if self.max_bytes is not None else None
+        max_entries = int(self.max_entries * 0.9) if self.max_entries is not None else None
+        victims = []
+        (count, size) = (self._count, self._bytes)
+        rows = self._db.execute('SELECT kind, id, size FROM objects ORDER BY accessed')
+        for (kind, id_, length) in rows:
+            if ((max_bytes is None or size <= max_bytes)
+                    and (max_entries is None or count <= max_entries)):
+                break
+            victims.append((kind, id_))
+            count -= 1
+            size -= length
+        rows.close()
+        self._db.execute('BEGIN')
+        self._db.executemany('DELETE FROM objects WHERE kind = ? AND id = ?', victims)
+        self._db.execute('COMMIT')
+        (self._count, self._bytes) = (count, size)
+        self._evicted += len(victims)
+
+    def _flush_access(self):
+        """
+        Writes the access times of the objects read since the last flush. The lock must
+        be held.
+        """
+        if not self._touched:
+            return
+        self._db.execute('BEGIN')
+        self._db.executemany('UPDATE objects SET accessed = ? WHERE kind = ? AND id = ?',
+                             [(accessed, kind, id_)
+                              for ((kind, id_), accessed) in self._touched.items()])
+        self._db.execute('COMMIT')
+        self._touched.clear()
+
+    def _encode(self, value):
+        """
+        Returns:
+            bytes: The object as JSON, compressed if enabled.
+        """
+        blob = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        return zlib.compress(blob, 1) if self.compress else blob
+
+    def _decode(self, blob):
+        """
+        Returns:
+            dict|list: The object, whether it was stored compressed or not.
+        """
+        if blob[:1] not in (b'{', b'['):
+            blob = zlib.decompress(blob)
+        return codec.loads(blob)
+
+def _is_confirmed(data):
+    """
+    Returns:
+        bool: True for a tx or an inscription included in a block.
+    """
+    return isinstance(data, dict) and 0 < (data.get('height') or 0) < UNCONFIRMED_HEIGHT
@@ -0,0 +1,286 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .routes import ROUTES
+from .UDS.pagination import paginate_route
+
+# One record of a synchronized block: kind is 'tx' (from `get_block_transactions`) or
+# 'brc20' (from `get_brc20_history` of `ticker`)
+SyncRecord = namedtuple('SyncRecord', ['height', 'kind', 'ticker', 'record'])
+
+class JSONCheckpoint:
+    """
+    Stores the progress of a SyncEngine in a JSON file, replaced atomically.
+    """
+
+    def __init__(self, path):
+        """
+        Parameters:
+            path (str): Path of the JSON file.
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Returns:
+            dict: The last saved state, None if nothing was saved yet.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        """
+        Writes the state to a temporary file, then moves it over the previous one.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        (fd, tmp_path) = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+class SqliteCheckpoint:
+    """
+    Stores the progress of a SyncEngine in a sqlite database, updated in a transaction.
+
+    Several engines can share the database with distinct names.
+    """
+
+    def __init__(self, path, name='default'):
+        """
+        Parameters:
+            path (str): Path of the sqlite database file.
+            name (str, optional): Name of the engine in the database.
+        """
+        self.name = name
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS checkpoints '
+                             '(name TEXT PRIMARY KEY, state TEXT NOT NULL)')
+
+    def load(self):
+        """
+        Returns:
+            dict: The last saved state, None if nothing was saved yet.
+        """
+        row = self._db.execute('SELECT state FROM checkpoints WHERE name = ?',
+                               (self.name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, state):
+        """
+        Replaces the saved state.
+        """
+        with self._db:
+            self._db.execute('INSERT OR REPLACE INTO checkpoints VALUES (?, ?)',
+                             (self.name, json.dumps(state)))
+
+class SyncEngine:
+    """
+    Follows the chain block by block from a stored checkpoint and hands the new
+    block transactions and BRC20 history to a handler.
+
+    Blocks up to `get_best_block_height` are fetched in parallel within a bounded window
+    but handed off in order, by batches of records. The checkpoint (last processed height
+    and offset in the next block) is saved after each batch, so a restart resumes where it
+    stopped. When the hash of the last processed block changes, the last `reorg_depth`
+    blocks are rolled back and synchronized again.
+    """
+
+    def __init__(self, client, checkpoint, handler, start_height, tickers=(),
+                 block_transactions=True, window=4, batch_size=500, page_size=100,
+                 reorg_depth=6, confirmations=0, on_rollback=None):
+        """
+        Initialize the SyncEngine instance.
+
+        Parameters:
+            client (Client): The client used to call the API.
+            checkpoint (JSONCheckpoint|SqliteCheckpoint): Stores the progress.
+            handler (callable): handler(records) called with a list of SyncRecord, all of
+                                the same block, in chain order.
+            start_height (int): First block to synchronize when no checkpoint exists.
+            tickers (iterable, optional): BRC20 tickers whose history is synchronized.
+            block_transactions (bool, optional): Synchronize the txs of every block.
+            window (int, optional): Number of blocks fetched in parallel. Defaults to 4.
+            batch_size (int, optional): Maximum number of records per handler call.
+            page_size (int, optional): Number of records requested per API call.
+            reorg_depth (int, optional): Number of blocks rolled back on a reorg.
+            confirmations (int, optional): Blocks under the best height left for later,
+                                           0 to follow the tip.
+            on_rollback (callable, optional): on_rollback(height) called when the data of
+                                              the blocks from `height` must be discarded.
+        """
+        self.client = client
+        self.checkpoint = checkpoint
+        self.handler = handler
+        self.start_height = start_height
+        self.tickers = list(tickers)
+        self.block_transactions = block_transactions
+        self.window = window
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.reorg_depth = reorg_depth
+        self.confirmations = confirmations
+        self.on_rollback = on_rollback
+        state = checkpoint.load()
+        if state is None:
+            state = {'height': start_height - 1, 'offset': 0, 'hashes': {}}
+        self.state = state
+
+    @property
+    def height(self):
+        """Height of the last block fully processed."""
+        return self.state['height']
+
+    def run_once(self):
+        """
+        Synchronizes every block up to the current best height.
+
+        Returns:
+            int: Number of blocks processed.
+        """
+        best = self.client.uds.brc20.get_best_block_height()['data']['height']
+        self._check_reorg()
+        target = best - self.confirmations
+        heights = range(self.height + 1, target + 1)
+        if not heights:
+            return 0
+        processed = 0
+        with ThreadPoolExecutor(max_workers=self.window, thread_name_prefix='unisat') as pool:
+            pending = deque()
+            iterator = iter(heights)
+            for height in iterator:
+                pending.append((height, pool.submit(self._fetch_block, height)))
+                if len(pending) >= self.window:
+                    break
+            while pending:
+                (height, future) = pending.popleft()
+                next_height = next(iterator, None)
+                if next_height is not None:
+                    pending.append((next_height, pool.submit(self._fetch_block, next_height)))
+                self._emit_block(height, *future.result())
+                processed += 1
+        return processed
+
+    def run_forever(self, interval=30, stop_event=None):
+        """
+        Calls `run_once()` every `interval` seconds until `stop_event` is set.
+
+        Parameters:
+            interval (float, optional): Seconds between two synchronizations.
+            stop_event (threading.Event, optional): Stops the loop when set.
+        """
+        stop_event = threading.Event() if stop_event is None else stop_event
+        while not stop_event.is_set():
+            self.run_once()
+            stop_event.wait(interval)
+
+    def _fetch_block(self, height):
+        """
+        Fetches every record of a block, on a worker thread.
+
+        Returns:
+            tuple: The records of the block and its hash (None if unknown).
+        """
+        records, block_hash = [], None
+        # blocks rolled back are fetched again from the API, their cached pages being
+        # the ones of the replaced blocks while the best height did not change
+        refetch = self.state.get('refetch')
+        use_cache = refetch is None or height > refetch
+        if self.block_transactions:
+            txs = paginate_route(self.client, ROUTES['get_block_transactions'], (height,),
+                                 self.page_size, use_cache=use_cache)
+            for tx in txs:
+                block_hash = block_hash or tx.get('blkid')
+                records.append(SyncRecord(height, 'tx', None, tx))
+        for ticker in self.tickers:
+            events = paginate_route(self.client, ROUTES['get_brc20_history'],
+                                    (ticker, None, height), self.page_size, use_cache=use_cache)
+            for event in events:
+                block_hash = block_hash or event.get('blockhash')
+                records.append(SyncRecord(height, 'brc20', ticker, event))
+        return (records, block_hash)
+
+    def _emit_block(self, height, records, block_hash):
+        """
+        Hands the records of a block to the handler by batches, saving the checkpoint
+        after each of them. Records already handed off before a restart are skipped.
+        """
+        offset = self.state['offset'] if height == self.height + 1 else 0
+        while offset < len(records):
+            batch = records[offset:offset + self.batch_size]
+            self.handler(batch)
+            offset += len(batch)
+            if offset < len(records):
+                self._save(self.height, offset)
+        hashes = self.state['hashes']
+        if block_hash is not None:
+            hashes[str(height)] = block_hash
+        for key in [key for key in hashes if int(key) <= height - self.reorg_depth]:
+            del hashes[key]
+        if self.state.get('refetch') is not None and height >= self.state['refetch']:
+            del self.state['refetch']
+        self._save(height, 0)
+
+    def _check_reorg(self):
+        """
+        Compares the stored hash of the last processed block with the current one,
+        and rolls back `reorg_depth` blocks if they differ.
+        """
+        stored = self.state['hashes'].get(str(self.height))
+        if stored is None:
+            return
+        current = self._get_block_hash(self.height)
+        if current is None or current == stored:
+            return
+        height = max(self.start_height, self.height - self.reorg_depth + 1)
+        self.client.log(f'reorg detected at block {self.height}, rolling back to {height}')
+        if self.on_rollback is not None:
+            self.on_rollback(height)
+        self.state['hashes'] = {k: v for (k, v) in self.state['hashes'].items()
+                                if int(k) < height}
+        self.state['refetch'] = max(self.height, self.state.get('refetch') or 0)
+        self._save(height - 1, 0)
+
+    def _get_block_hash(self, height):
+        """
+        Asks the API for the hash of a block, bypassing the response cache whose entries
+        for a block stay valid while the best height does not change, even when the tip
+        is replaced.
+
+        Returns:
+            str: The hash of the block at `height` reported by the API, None if unknown.
+        """
+        if self.block_transactions:
+            request = ROUTES['get_block_transactions'].build(height, 0, 1)
+            txs = self.client.call(*request, use_cache=False)['data'] or []
+            return txs[0].get('blkid') if txs else None
+        for ticker in self.tickers:
+            request = ROUTES['get_brc20_history'].build(ticker, None, height, 0, 1)
+            response = self.client.call(*request, use_cache=False)
+            detail = (response['data'] or {}).get('detail') or []
+            if detail:
+                return detail[0].get('blockhash')
+        return None
+
+    def _save(self, height, offset):
+        """
+        Updates and persists the checkpoint.
+        """
+        self.state['height'] = height
+        self.state['offset'] = offset
+        self.checkpoint.save(self.state)
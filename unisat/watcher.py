@@ -0,0 +1,284 @@
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import UNCONFIRMED_HEIGHT
+from .client import ClientError
+from .routes import ROUTES
+from .UDS.pagination import paginate_route
+
+# One change of a new block: kind is 'tx' (a tx of the block from `get_block_transactions`,
+# or of the history of `address`) or 'brc20' (an event of the `get_brc20_history` of
+# `ticker`, involving `address` for address watches)
+WatchEvent = namedtuple('WatchEvent', ['height', 'kind', 'ticker', 'address', 'record'])
+
+class Watch:
+    """
+    A callback registered on a BlockWatcher, returned by the `watch_` methods.
+    """
+
+    def __init__(self, callback, ticker=None, address=None, tickers=(), txs=False):
+        self.callback = callback
+        self.ticker = ticker
+        self.address = address
+        self.tickers = frozenset(tickers)
+        self.txs = txs
+
+class BlockWatcher:
+    """
+    Follows the best BRC20 block height and dispatches the changes of every new block to
+    the callbacks watching a ticker, an address or the blocks.
+
+    The best height is polled with an adaptive interval: `min_interval` after a new block
+    (blocks often come in bursts while the indexer catches up), then growing by `backoff`
+    up to `max_interval` while nothing changes, and `max_interval` after a failure. When
+    a block arrives, its delta is fetched once whatever the number of callbacks: the
+    `get_brc20_history` of the block for each watched ticker, `get_block_transactions`
+    when blocks are watched, and the txs of the block in the history of each address
+    watched with `txs=True`. A block is only dispatched once all of them are fetched, a
+    failed fetch being tried again on the next poll.
+    """
+
+    def __init__(self, client, start_height=None, min_interval=5, max_interval=60, backoff=2.0,
+                 page_size=100, max_workers=None):
+        """
+        Initialize the BlockWatcher instance.
+
+        Parameters:
+            client (Client): The client used to call the API.
+            start_height (int, optional): First block dispatched. Defaults to None (only
+                                          the blocks found after the first poll).
+            min_interval (float, optional): Seconds between polls after a new block.
+            max_interval (float, optional): Upper bound of the poll interval, in seconds.
+            backoff (float, optional): Growth of the interval while no block arrives.
+            page_size (int, optional): Number of records requested per API call.
+            max_workers (int, optional): Number of fetches in flight for a block.
+                                         Defaults to the connection pool size of the client.
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.page_size = page_size
+        self.max_workers = max_workers or client.pool_maxsize
+        self.height = None if start_height is None else start_height - 1
+        self.interval = min_interval
+        self._block_hash = None
+        self._watches = []
+        self._lock = threading.Lock()
+        self._polls = 0
+        self._blocks = 0
+        self._fetches = 0
+        self._events = 0
+        self._failures = 0
+        self._callback_errors = 0
+
+    def watch_ticker(self, ticker, callback):
+        """
+        Calls `callback(events)` with the BRC20 history of `ticker` in every new block.
+
+        Returns:
+            Watch: The registration, to give to `unwatch()`.
+        """
+        return self._add(Watch(callback, ticker=ticker))
+
+    def watch_address(self, address, callback, tickers=(), txs=True):
+        """
+        Calls `callback(events)` with the changes of `address` in every new block.
+
+        Parameters:
+            address (str): Address
+            callback (callable): callback(events) called with a list of WatchEvent.
+            tickers (iterable, optional): BRC20 tickers whose events sent or received by
+                                          the address are reported.
+            txs (bool, optional): Report the txs of the address, at the cost of one
+                                  `get_address_history` call per new block.
+
+        Returns:
+            Watch: The registration, to give to `unwatch()`.
+        """
+        return self._add(Watch(callback, address=address, tickers=tickers, txs=txs))
+
+    def watch_blocks(self, callback):
+        """
+        Calls `callback(events)` with every tx of every new block.
+
+        Returns:
+            Watch: The registration, to give to `unwatch()`.
+        """
+        return self._add(Watch(callback))
+
+    def unwatch(self, watch):
+        """
+        Removes a registration, the deltas it needed are no longer fetched.
+        """
+        with self._lock:
+            self._watches = [w for w in self._watches if w is not watch]
+
+    def poll(self):
+        """
+        Polls the best height and dispatches every new block, in order.
+
+        Returns:
+            int: Number of blocks dispatched.
+
+        Raises:
+            ClientError: If the API calls fail, the blocks after the last dispatched one
+                         are fetched again on the next poll.
+        """
+        self._polls += 1
+        data = self.client.uds.brc20.get_best_block_height()['data']
+        (best, block_hash) = (data['height'], data.get('blockid'))
+        if self.height is None:
+            (self.height, self._block_hash) = (best, block_hash)
+            return 0
+        replaced = None
+        if best == self.height and block_hash and self._block_hash and \
+                block_hash != self._block_hash:
+            # the tip was replaced, its changes are dispatched again from the API, the
+            # cached pages being the ones of the replaced block
+            self.client.log(f'block {best} replaced, dispatching it again', logging.WARNING)
+            replaced = best
+            self.height -= 1
+        dispatched = 0
+        while self.height < best:
+            height = self.height + 1
+            self._dispatch(height, self._fetch(height, use_cache=height != replaced))
+            self.height = height
+            self._blocks += 1
+            dispatched += 1
+        self._block_hash = block_hash
+        return dispatched
+
+    def run_forever(self, stop_event=None):
+        """
+        Polls with the adaptive interval until `stop_event` is set, failed polls being
+        logged and tried again after `max_interval`.
+
+        Parameters:
+            stop_event (threading.Event, optional): Stops the loop when set.
+        """
+        stop_event = threading.Event() if stop_event is None else stop_event
+        while not stop_event.is_set():
+            try:
+                dispatched = self.poll()
+            except ClientError:
+                self._failures += 1
+                self.interval = self.max_interval
+            else:
+                if dispatched:
+                    self.interval = self.min_interval
+                else:
+                    self.interval = min(self.max_interval, self.interval * self.backoff)
+            stop_event.wait(self.interval)
+
+    def stats(self):
+        """
+        Returns:
+            dict: The number of polls, blocks dispatched, delta fetches, events and
+                  failures, and the current poll interval.
+        """
+        return {
+            'height': self.height,
+            'polls': self._polls,
+            'blocks': self._blocks,
+            'fetches': self._fetches,
+            'events': self._events,
+            'failures': self._failures,
+            'callback_errors': self._callback_errors,
+            'interval': self.interval,
+            'watches': len(self._watches),
+        }
+
+    def _add(self, watch):
+        with self._lock:
+            self._watches = self._watches + [watch]
+        return watch
+
+    def _fetch(self, height, use_cache=True):
+        """
+        Fetches the delta of a block needed by the current watches, each part once,
+        from the response cache of the client unless `use_cache` is False.
+
+        Returns:
+            tuple: The watches to notify, and the records of each part by its key:
+                   ('brc20', ticker), ('tx', address) or ('block', None).
+        """
+        watches = self._watches
+        parts = set()
+        for watch in watches:
+            if watch.ticker is not None:
+                parts.add(('brc20', watch.ticker))
+            elif watch.address is not None:
+                parts.update(('brc20', ticker) for ticker in watch.tickers)
+                if watch.txs:
+                    parts.add(('tx', watch.address))
+            else:
+                parts.add(('block', None))
+        if not parts:
+            return (watches, {})
+        workers = min(self.max_workers, len(parts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='unisat') as pool:
+            futures = {part: pool.submit(self._fetch_part, height, *part, use_cache)
+                       for part in parts}
+            records = {part: future.result() for (part, future) in futures.items()}
+        self._fetches += len(parts)
+        return (watches, records)
+
+    def _fetch_part(self, height, kind, key, use_cache=True):
+        """
+        Returns:
+            list: The records of a part of the delta of a block.
+        """
+        if kind == 'brc20':
+            return list(paginate_route(self.client, ROUTES['get_brc20_history'],
+                                       (key, None, height), self.page_size,
+                                       use_cache=use_cache))
+        if kind == 'block':
+            return list(paginate_route(self.client, ROUTES['get_block_transactions'],
+                                       (height,), self.page_size, use_cache=use_cache))
+        txs = []
+        history = paginate_route(self.client, ROUTES['get_address_history'], (key,),
+                                 self.page_size, use_cache=use_cache)
+        # the history is sorted from the most recent tx, unconfirmed ones first
+        for tx in history:
+            tx_height = tx.get('height')
+            if tx_height is None or tx_height < 0 or tx_height >= UNCONFIRMED_HEIGHT:
+                continue
+            if tx_height < height:
+                break
+            if tx_height == height:
+                txs.append(tx)
+        return txs
+
+    def _dispatch(self, height, delta):
+        """
+        Hands the events of a block to each watch, an exception raised by a callback
+        being logged without stopping the others.
+        """
+        (watches, records) = delta
+        for watch in watches:
+            if watch.ticker is not None:
+                events = [WatchEvent(height, 'brc20', watch.ticker, None, record)
+                          for record in records[('brc20', watch.ticker)]]
+            elif watch.address is not None:
+                address = watch.address
+                events = [WatchEvent(height, 'brc20', ticker, address, record)
+                          for ticker in sorted(watch.tickers)
+                          for record in records[('brc20', ticker)]
+                          if address in (record.get('from'), record.get('to'))]
+                if watch.txs:
+                    events += [WatchEvent(height, 'tx', None, address, record)
+                               for record in records[('tx', address)]]
+            else:
+                events = [WatchEvent(height, 'tx', None, None, record)
+                          for record in records[('block', None)]]
+            if not events:
+                continue
+            self._events += len(events)
+            try:
+                watch.callback(events)
+            except Exception:
+                self._callback_errors += 1
+                self.client.logger.exception('watcher callback failed on block %s', height)